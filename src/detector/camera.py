@@ -5,8 +5,11 @@ from models.sensor_data import RawSensorData, CameraData
 from numba import njit
 from detector.ray import Rays
         
-def process_camera(rawData: RawSensorData):
-    height, width, _ = cv2.imread(rawData.image_path).shape
+def process_camera(rawData: RawSensorData, image_shape: tuple[int, ...] | None = None):
+    # Reuse the shape of an already decoded image instead of decoding it again
+    if image_shape is None:
+        image_shape = cv2.imread(rawData.image_path, cv2.IMREAD_GRAYSCALE).shape
+    height, width = image_shape[:2]
     
     # Calculate camera constants
     focal_length = (width / 2) / math.tan(math.radians(rawData.fov) / 2)
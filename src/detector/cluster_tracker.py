@@ -61,25 +61,24 @@ class ClusterTracker:
             del self.cluster_history[id]
             print(f'Deleted cluster {id} after {self.max_age} frames of inactivity')
             
-    def calculate_velocity(self, ids: list[int]) -> dict[int, np.ndarray]:
-        velocities: dict[int, np.ndarray] = {}
+    def snapshot(self, ids: list[int]) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Returns the latest positions (N, 3) and velocities (N, 3) of the
+        clusters, with rows aligned to ids
+        '''
+        positions = np.zeros((len(ids), 3))
+        velocities = np.zeros((len(ids), 3))
         
-        for id in ids:
-            centroids = self.cluster_history[id]['centroids']
-            timestamps = self.cluster_history[id]['timestamp']
-            
-            if (len(centroids) < 2 or len(timestamps) < 2):
-                velocities[id] = np.array([0., 0., 0.])
-            else:
-                velocities[id] = (centroids[-1] - centroids[-2]) / (timestamps[-1] - timestamps[-2])
+        for row, id in enumerate(ids):
+            hist = self.cluster_history[id]
+            centroids = hist['centroids']
+            timestamps = hist['timestamp']
             
-        return velocities
-    
-    def get_cluster_position(self, ids: list[int]) -> dict[int, np.ndarray]:
-        pos = {}
-        for id in ids:
-            pos[id] = self.cluster_history[id]['centroids'][-1]
-        return pos
+            positions[row] = centroids[-1]
+            if len(centroids) >= 2 and len(timestamps) >= 2:
+                velocities[row] = (centroids[-1] - centroids[-2]) / (timestamps[-1] - timestamps[-2])
+        
+        return positions, velocities
     
 def get_cluster_centers(data: np.ndarray, eps: float) -> np.ndarray:
     """Return an array of all cluster centers in a dataset
@@ -106,7 +105,7 @@ if __name__ == '__main__':
     
     for i in range(0, len(data), 2):
         result = tracker.track_clusters(data[i : i + 2])
-        vel = tracker.calculate_velocity(result)
+        _, vel = tracker.snapshot(result)
         print(vel)
         tracker.cleanup_old_clusters()
         # print(result)
\ No newline at end of file
@@ -1,4 +1,6 @@
 import sqlite3
+import base64
+import numpy as np
 import requests
 from typing import Protocol, List
 from models import ObjectData
@@ -6,13 +8,28 @@ from models import ObjectData
 class Exporter(Protocol):
     def export(self, data: List[ObjectData]) -> None:
         ...
+
+def to_columns(data: List[ObjectData]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Stacks objects into ids (N, ), timestamps (N, ), positions (N, 3) and velocities (N, 3)"""
+    ids = np.array([d.id for d in data], dtype=np.float64)
+    timestamps = np.array([d.timestamp for d in data], dtype=np.float64)
+    positions = np.array([d.position for d in data], dtype=np.float64).reshape(-1, 3)
+    velocities = np.array([d.velocity for d in data], dtype=np.float64).reshape(-1, 3)
+    return ids, timestamps, positions, velocities
         
 class ExportToSQLite:
     def __init__(self, db_path: str):
         self.db_path = db_path
         
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
+        # Keep one connection open for the lifetime of the exporter
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL lets the map importer read while rows are appended and only
+        # syncs at checkpoints instead of on every commit
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        with self.connection:
+            cursor = self.connection.cursor()
             cursor.execute("DROP TABLE IF EXISTS ProcessedData")
             cursor.execute("""CREATE TABLE ProcessedData (
                 RowID INTEGER PRIMARY KEY, 
@@ -28,26 +45,23 @@ class ExportToSQLite:
             )""")
         
     def export(self, data: List[ObjectData]) -> None:
-        with sqlite3.connect(self.db_path) as connection:
-            cursor = connection.cursor()
-            
-            for d in data:
-                tabulated = (
-                    d.id, 
-                    d.timestamp, 
-                    d.position[0], 
-                    d.position[1], 
-                    d.position[2],
-                    d.velocity[0],
-                    d.velocity[1],
-                    d.velocity[2]
-                )
+        if not data:
+            return
+
+        # Positions are (lon, lat, alt)
+        ids, timestamps, positions, velocities = to_columns(data)
+        rows = np.column_stack((ids, timestamps, positions[:, [1, 0, 2]], velocities)).tolist()
+
+        # Single transaction for the whole batch
+        with self.connection:
+            self.connection.executemany("""INSERT INTO ProcessedData
+                (CameraID, Timestamp, Latitude, Longitude, Altitude, VelocityX, VelocityY, VelocityZ)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
 
-                cursor.execute("""INSERT INTO ProcessedData
-                    (CameraID, Timestamp, Latitude, Altitude, Longitude, VelocityX, VelocityY, VelocityZ)
-                    VALUES(?, ?, ?, ?, ?, ?, ?, ?)""",
-                    tabulated
-                )
+    def close(self) -> None:
+        self.connection.close()
         
 class ExportToCLI:
     def export(self, data: List[ObjectData]) -> None:
@@ -61,17 +75,11 @@ class ExportToDashboard:
         if not data:
             return
             
-        payload = {"objects": []}
-        for obj in data:
-            payload["objects"].append({
-                "id": obj.id,
-                "lat": obj.position[1], 
-                "lon": obj.position[0], 
-                "alt": obj.position[2] if len(obj.position) > 2 else 0.0,
-                "vx": obj.velocity[0] if len(obj.velocity) > 0 else 0.0,
-                "vy": obj.velocity[1] if len(obj.velocity) > 1 else 0.0,
-                "vz": obj.velocity[2] if len(obj.velocity) > 2 else 0.0
-            })
+        # Pack the whole fleet into a single (N, 7) float64 buffer
+        # with columns (id, lat, lon, alt, vx, vy, vz)
+        ids, _, positions, velocities = to_columns(data)
+        state = np.column_stack((ids, positions[:, [1, 0, 2]], velocities)).astype('<f8')
+        payload = {"state": base64.b64encode(state.tobytes()).decode('ascii')}
             
         try:
             # Post data to dashboard
@@ -4,6 +4,7 @@ import math
 import time
 from queue import Queue, Empty
 import threading
+from concurrent.futures import ThreadPoolExecutor, Future
 import json
 import asyncio
 import cv2
@@ -39,27 +40,38 @@ class DataPipeline:
         self.origin_lonlat: np.ndarray | None = None
         self.min_cameras = 0
         self.confidence = 0
+        # Reads camera images and prepares cameras in the background
+        self._io_pool = ThreadPoolExecutor(thread_name_prefix='camera-io')
+        self._masks: dict[str, Future] = {}
         
     def run(self) -> List[ObjectData]:
         print('Batching')
         # Call Batcher
         batch = self.batcher.batch()
+
+        # Start decoding every motion mask now so it overlaps camera processing
+        # and the ray casting of earlier cameras
+        self._masks = {rawData.image_path: self._io_pool.submit(read_grayscale, rawData.image_path) for rawData in batch}
         
         print('Processing Camera Data')
         # Call Camera Processor
-        batch = [dt.process_camera(rawData) for rawData in batch]
+        batch = [dt.process_camera(rawData, self._masks[rawData.image_path].result().shape) for rawData in batch]
 
         print('Raytracing')
         avg_timestamp: float = 0.0
-        for cameraData in batch:
+        # Masks are turned into rays for every camera concurrently on the I/O
+        # pool (all masks are already decoded above, so no task waits on
+        # another), ray casting (already parallel over rays) consumes them in order
+        for cameraData, rays in zip(batch, self._io_pool.map(self.prepare_camera, batch)):
             print(f'Processing camera {cameraData.cam_id}: {cameraData.image_path}')
-            cameraData.position = lonlat_to_local_meters(cameraData.position, self.origin_lonlat)
-            motion_mask = cv2.imread(cameraData.image_path, cv2.IMREAD_GRAYSCALE)
-            rays = dt.get_camera_rays(cameraData, motion_mask)
-            raycast_intersections, data = self.voxel_tracer.raycast_into_voxels_batch(rays)
-            self.voxel_tracer.add_grid_data(raycast_intersections, data)
             avg_timestamp += cameraData.timestamp
             os.remove(cameraData.image_path)
+            # Skip cameras without motion
+            if rays is None:
+                continue
+
+            raycast_intersections, data = self.voxel_tracer.raycast_into_voxels_batch(rays)
+            self.voxel_tracer.add_grid_data(raycast_intersections, data)
 
             if self.graph and len(rays.origins) > 0:
                 # The middle ray represents the camera's forward view
@@ -94,20 +106,26 @@ class DataPipeline:
         centroids = dt.get_cluster_centers(motion_voxels, config['cluster_tracker']['eps'])
         
         ids = self.cluster_tracker.track_clusters(centroids, avg_timestamp)
-        positions = self.cluster_tracker.get_cluster_position(ids)
-        velocities = self.cluster_tracker.calculate_velocity(ids)
+        positions, velocities = self.cluster_tracker.snapshot(ids)
+        # Convert every position at once, rows stay aligned with ids
+        latlon_positions = local_meters_to_lonlat(positions, self.origin_lonlat)
         
-        objects: List[ObjectData] = []
-        for id in ids:
-            latlon_pos = local_meters_to_lonlat(positions[id], self.origin_lonlat)
-            objects.append(ObjectData(
-                id, avg_timestamp, latlon_pos, velocities[id]
-            ))
+        objects: List[ObjectData] = [
+            ObjectData(id, avg_timestamp, latlon_pos, velocity)
+            for id, latlon_pos, velocity in zip(ids, latlon_positions, velocities)
+        ]
         self.cluster_tracker.cleanup_old_clusters()
 
         self.exporter.export(objects)
         
         return objects
+
+    def prepare_camera(self, cameraData: CameraData) -> dt.Rays | None:
+        """Moves the camera into local meters and returns the rays through its
+        motion mask pixels (None if the mask has no motion)"""
+        cameraData.position = lonlat_to_local_meters(cameraData.position, self.origin_lonlat)
+        motion_mask = self._masks.pop(cameraData.image_path).result()
+        return dt.get_camera_rays(cameraData, motion_mask)
         
     def run_continously(self):
         # Setup asyncio event thread for this thread
@@ -133,13 +151,17 @@ class DataPipeline:
             # the queue is empty or processing is instant
             time.sleep(0.01)
 
+def read_grayscale(image_path: str) -> np.ndarray:
+    """Reads an image as grayscale"""
+    return cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+
 def lonlat_to_local_meters(target_lonlat: np.ndarray, origin_lonlat: np.ndarray) -> np.ndarray:
     """
-    Converts a [Lon, Lat] array to local [X, Y] meters relative to an origin.
+    Converts a [Lon, Lat] array (or (N, M) rows of them) to local [X, Y] meters relative to an origin.
     Returns: np.ndarray [x_meters_east, y_meters_north]
     """
-    lon_diff = target_lonlat[0] - origin_lonlat[0]
-    lat_diff = target_lonlat[1] - origin_lonlat[1]
+    lon_diff = target_lonlat[..., 0] - origin_lonlat[0]
+    lat_diff = target_lonlat[..., 1] - origin_lonlat[1]
     
     meters_per_degree_lat = 111320.0
     
@@ -148,24 +170,26 @@ def lonlat_to_local_meters(target_lonlat: np.ndarray, origin_lonlat: np.ndarray)
     # Y is Latitude
     y_meters = lat_diff * meters_per_degree_lat
     
-    result = target_lonlat.copy()
-    result[:2] = [x_meters, y_meters]
+    result = target_lonlat.astype(np.float64)
+    result[..., 0] = x_meters
+    result[..., 1] = y_meters
     return result
 
 def local_meters_to_lonlat(local_meters: np.ndarray, origin_lonlat: np.ndarray) -> np.ndarray:
     """
-    Converts local [X, Y] meters back to [Lon, Lat] relative to an origin.
+    Converts local [X, Y] meters (or (N, M) rows of them) back to [Lon, Lat] relative to an origin.
     Returns: np.ndarray [target_lon, target_lat]
     """
     meters_per_degree_lat = 111320.0
-    x_meters, y_meters = local_meters[0], local_meters[1]
+    x_meters, y_meters = local_meters[..., 0], local_meters[..., 1]
     lon_0, lat_0 = origin_lonlat[0], origin_lonlat[1]
     
     target_lon = lon_0 + (x_meters / (meters_per_degree_lat * np.cos(np.radians(lat_0))))
     target_lat = lat_0 + (y_meters / meters_per_degree_lat)
 
-    result = local_meters.copy()
-    result[:2] = [target_lon, target_lat]
+    result = local_meters.astype(np.float64)
+    result[..., 0] = target_lon
+    result[..., 1] = target_lat
     return result
 
 class DetectorParameters(BaseModel):
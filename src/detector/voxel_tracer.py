@@ -1,5 +1,5 @@
 import numpy as np
-from numba import njit
+from numba import njit, prange
 from detector.ray import Ray, Rays
 
 MAX_RAY_STEPS = 512
@@ -129,8 +129,6 @@ class VoxelTracer:
     def _raycast_batch(rays: Rays, grid_min: np.ndarray, 
                        grid_max: np.ndarray, grid_size: np.ndarray, 
                        voxel_size: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-        voxels = []
-
         # Check if ray intersects voxel grid
         intersected, t_entry = ray_aabb_batch(rays, grid_min, grid_max)
 
@@ -160,44 +158,63 @@ class VoxelTracer:
         # Handle division by zero
         # tMax[rays.norm_dirs == 0] = np.inf
 
-        # Traversal
-        voxels.append(current_voxels.copy())
-        filtered_accum = rays.accumulation[intersected]
-        data = [filtered_accum]
-        # Get the number of rows
-        for _ in range(MAX_RAY_STEPS):
-            # Find which axis has the smallest tMax and traverse on that axis
-            ind = np.argmin(tMax, axis=1)
-            # Move in the direction of the smallest tMax value
-            step_voxels(current_voxels, steps, ind)
-            # Get mask of voxels inside the grid
-            inside_grid = np.logical_and.reduce((current_voxels >= 0) & (current_voxels < grid_size), axis=1)
-            # Check if every voxel is outside grid
-            if all_false(inside_grid): break
-            # Add delta to tMax only for rows that are inside the grid
-            tmax_update(tMax, deltas, inside_grid, ind)
-            voxels.append(current_voxels.copy()[inside_grid])
-            data.append(filtered_accum[inside_grid])
-        return np.concatenate(voxels), np.concatenate(data)
+        # Traversal, every ray is walked independently in parallel
+        return traverse_rays(current_voxels, steps, deltas, tMax, grid_size, rays.accumulation[intersected])
     
 @njit
-def step_voxels(voxels: np.ndarray, steps: np.ndarray, ind: np.ndarray) -> None:
-    for i in range(len(voxels)):
-        axis = ind[i]
-        voxels[i, axis] += steps[i, axis]
+def min_axis(tMax: np.ndarray) -> int:
+    """Index of the smallest tMax (first NaN or first minimum, like np.argmin)"""
+    best = 0
+    if np.isnan(tMax[0]): return best
+    for axis in range(1, 3):
+        if np.isnan(tMax[axis]): return axis
+        if tMax[axis] < tMax[best]: best = axis
+    return best
 
 @njit
-def tmax_update(tMax: np.ndarray, delta: np.ndarray, inside: np.ndarray, ind: np.ndarray) -> None:
-    for i in range(len(inside)):
-        if inside[i]:
-            axis = ind[i]
-            tMax[i, axis] += delta[i, axis] 
-        
-@njit
-def all_false(arr: np.ndarray) -> bool:
-    for i in range(len(arr)):
-        if arr[i]: return False
-    return True
+def walk_ray(i: int, start: np.ndarray, steps: np.ndarray, deltas: np.ndarray, tMax: np.ndarray, 
+             grid_size: np.ndarray, out: np.ndarray, offset: int) -> int:
+    """Walks ray i from its start voxel until it leaves the grid or MAX_RAY_STEPS is reached.
+    Writes the visited voxels to out[offset:] unless out is empty. Returns the number visited"""
+    write = out.shape[0] > 0
+    voxel = start[i].copy()
+    t = tMax[i].copy()
+    if write: out[offset] = voxel
+    count = 1
+    for _ in range(MAX_RAY_STEPS):
+        # Find which axis has the smallest tMax and traverse on that axis
+        axis = min_axis(t)
+        voxel[axis] += steps[i, axis]
+        if voxel[axis] < 0 or voxel[axis] >= grid_size[axis]: break
+        t[axis] += deltas[i, axis]
+        if write: out[offset + count] = voxel
+        count += 1
+    return count
+
+@njit(parallel=True)
+def traverse_rays(starts: np.ndarray, steps: np.ndarray, deltas: np.ndarray, tMax: np.ndarray, 
+                  grid_size: np.ndarray, accum: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns every voxel (M, 3) visited by the rays and the accumulation value (M, ) of
+    the ray that visited it. Counts the voxels per ray first so every ray can be written 
+    to its own slice of the output without locking"""
+    n = starts.shape[0]
+    empty = np.empty((0, 3), dtype=np.int64)
+
+    # Pass 1: number of voxels per ray
+    counts = np.empty(n, dtype=np.int64)
+    for i in prange(n):
+        counts[i] = walk_ray(i, starts, steps, deltas, tMax, grid_size, empty, 0)
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+
+    # Pass 2: write voxels into each ray's slice
+    voxels = np.empty((offsets[n], 3), dtype=np.int64)
+    data = np.empty(offsets[n], dtype=accum.dtype)
+    for i in prange(n):
+        walk_ray(i, starts, steps, deltas, tMax, grid_size, voxels, offsets[i])
+        data[offsets[i]:offsets[i + 1]] = accum[i]
+    return voxels, data
 
 @njit   
 def ray_aabb(ray: Ray, boxMin: np.ndarray, boxMax: np.ndarray, t_entry: np.ndarray) -> bool:
@@ -80,28 +80,27 @@ class ExportToSQLite():
         self.db_path = database_path
 
     def export(self, batch: list[dict]):
+        rows = [(
+                data['id'], 
+                data['timestamp'], 
+                data['position']['latitude'], 
+                data['position']['altitude'], 
+                data['position']['longitude'], 
+                data['orientation']['roll'], 
+                data['orientation']['pitch'], 
+                data['orientation']['yaw'], 
+                data['fov'], 
+                data['image_path']
+            ) for data in batch]
+
+        # One statement and one transaction for the whole batch
         with sqlite3.connect(self.db_path) as connection:
-            for data in batch:
-                insert = (
-                    data['id'], 
-                    data['timestamp'], 
-                    data['position']['latitude'], 
-                    data['position']['altitude'], 
-                    data['position']['longitude'], 
-                    data['orientation']['roll'], 
-                    data['orientation']['pitch'], 
-                    data['orientation']['yaw'], 
-                    data['fov'], 
-                    data['image_path']
-                )
-                cursor = connection.cursor()
-                
-                cursor.execute("""
-                            INSERT INTO SensorData 
-                            (CameraID, Timestamp, Latitude, Altitude, Longitude, Roll, Pitch, Yaw, FOV, ImagePath)
-                            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", 
-                            insert
-                )
+            connection.executemany("""
+                        INSERT INTO SensorData 
+                        (CameraID, Timestamp, Latitude, Altitude, Longitude, Roll, Pitch, Yaw, FOV, ImagePath)
+                        VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", 
+                        rows
+            )
 
     def setup(self):
         os.makedirs(self.db_path.parent, exist_ok=True)
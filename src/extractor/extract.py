@@ -10,20 +10,12 @@ import numpy as np
 from cv2.typing import MatLike
 from extractor import filter_motion, Exporter, ExportToRedis, ExportToSQLite
 
-def get_latest_file(path: Path) -> Path | None:
-    if not os.path.exists(path):
-        return None
-    
-    files = os.listdir(path)
-    paths = [path / base for base in files]
-    if len(paths) <= 0: return None
-    
-    return max(paths, key=os.path.getctime)
-
 class Extractor:
     def __init__(self, image_directory: Path, exporter: Exporter, timeout: float):
         self.image_dir = image_directory
         self.urls: dict[str, tuple[str, Path]] = {}
+        # Last decoded frame of every camera, motion is filtered against it
+        self.prev_frames: dict[str, MatLike] = {}
         self.url_count = 0
         self.exporter = exporter
         self.timeout = timeout
@@ -42,7 +34,6 @@ class Extractor:
 
         # Add url folder to images/
         os.makedirs(url_folder_dir)
-        os.makedirs(url_folder_dir / 'preprocessed')
         os.makedirs(url_folder_dir / 'processed')
 
         # Add to map of urls
@@ -89,23 +80,17 @@ class Extractor:
             print(f'ERROR: Sensor Data request to {url} failed')
             return None
         
-        # Get the latest unprocessed image in 
-        # image_dir/{id}/preprocessed if it exists
-        preprocessed_path = basepath / 'preprocessed'
-        prev_img_path = get_latest_file(preprocessed_path)
-        
-        image_path = preprocessed_path / (str(sensor_data['timestamp']) + '.jpg')
-        cv2.imwrite(image_path, image)
+        # Keep the frame in memory for the next request instead of
+        # writing it to disk and decoding it again
+        prev = self.prev_frames.get(url)
+        self.prev_frames[url] = image
 
         # Only filter motion once two images exist at a time
-        if prev_img_path is None:
+        if prev is None:
             return None
         
-        # Filter for motion and remove old unprocessed image
-        prev = cv2.imread(prev_img_path, cv2.IMREAD_COLOR)
+        # Filter for motion against the previous frame
         filtered = filter_motion(prev, image, 250)
-        # Delete unprocessed image
-        os.remove(prev_img_path)
         
         # Save the filtered image
         processed_path = basepath / 'processed' / (str(sensor_data['timestamp']) + '.jpg')
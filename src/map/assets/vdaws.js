@@ -0,0 +1,87 @@
+// Clientside rendering for the legacy map (map_legacy.py).
+// The server only publishes drone state and collision pairs to the
+// 'drone-state' store, the geometry below runs in the browser.
+
+const ARROW_OFFSET = 0.00025;
+// Never extrapolate further than this past the last server state (seconds)
+const MAX_EXTRAPOLATION = 2.0;
+
+// Last state received from the server and when it arrived
+let lastState = null;
+let receivedAt = 0;
+// Unit heading of every drone in lastState (null when not moving)
+let headings = [];
+
+function unitHeadings(state) {
+    const result = new Array(state.vlat.length);
+    for (let i = 0; i < state.vlat.length; i++) {
+        const speedMag = Math.hypot(state.vlat[i], state.vlon[i]);
+        result[i] = speedMag > 0 ? [state.vlat[i] / speedMag, state.vlon[i] / speedMag] : null;
+    }
+    return result;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    vdaws: {
+        /**
+         * Rebuilds the drone, heading and collision traces of the base figure.
+         * Runs on every new server state and on every render tick in between,
+         * moving each drone along its last known velocity (lat += vlat * dt).
+         *
+         * state: {ids, lat, lon, alt, vlat, vlon, collisions: [[row_a, row_b], ...]}
+         * n: Render interval ticks (only used as a trigger)
+         * figure: Current map figure (trace 0 drones, 1 headings, 2 collisions)
+         */
+        render: function(state, n, figure) {
+            if (!state || !figure) {
+                return window.dash_clientside.no_update;
+            }
+
+            if (state !== lastState) {
+                lastState = state;
+                receivedAt = performance.now();
+                // Velocities only change with a new state, not on render ticks
+                headings = unitHeadings(state);
+            }
+            const dt = Math.min((performance.now() - receivedAt) / 1000, MAX_EXTRAPOLATION);
+
+            // Linear extrapolation and direction vectors
+            const lat = new Array(state.lat.length);
+            const lon = new Array(state.lon.length);
+            const arrowLat = [];
+            const arrowLon = [];
+            for (let i = 0; i < state.lat.length; i++) {
+                // The server converts velocities to degrees per second along lat and lon
+                lat[i] = state.lat[i] + state.vlat[i] * dt;
+                lon[i] = state.lon[i] + state.vlon[i] * dt;
+
+                const heading = headings[i];
+                if (heading) {
+                    // Correct vector orientation for visual map (lat is Y, lon is X)
+                    arrowLat.push(lat[i] + heading[0] * ARROW_OFFSET);
+                    arrowLon.push(lon[i] + heading[1] * ARROW_OFFSET);
+                }
+            }
+
+            // Line segments between colliding drones
+            const lineLat = [];
+            const lineLon = [];
+            for (const [a, b] of state.collisions) {
+                // null breaks the connection between different pairs
+                lineLat.push(lat[a], lat[b], null);
+                lineLon.push(lon[a], lon[b], null);
+            }
+
+            const data = figure.data.slice();
+            data[0] = Object.assign({}, data[0], {
+                lat: lat,
+                lon: lon,
+                hovertext: state.ids.map(id => 'ID:' + id),
+                marker: Object.assign({}, data[0].marker, {color: state.alt})
+            });
+            data[1] = Object.assign({}, data[1], {lat: arrowLat, lon: arrowLon});
+            data[2] = Object.assign({}, data[2], {lat: lineLat, lon: lineLon});
+            return Object.assign({}, figure, {data: data});
+        }
+    }
+});
@@ -1,106 +1,152 @@
 import math
-from typing import List, Tuple, Dict
-from flying_object import FlyingObject
+import numpy as np
+from typing import List
+from flying_object import FlyingObject, pack_states
+from spatial_index import QuadTree
 
 class CollisionEvent:
-    def __init__(self, drone_a_id, drone_b_id, time_to_impact, distance_at_impact):
+    def __init__(self, drone_a_id, drone_b_id, time_to_impact, distance_at_impact, row_a=None, row_b=None):
         self.drone_a_id = drone_a_id
         self.drone_b_id = drone_b_id
         self.time_to_impact = time_to_impact
         self.distance_at_impact = distance_at_impact
+        # Rows of both drones in the states array passed to detect_collisions_array
+        self.row_a = row_a
+        self.row_b = row_b
 
 class CollisionDetector:
-    def __init__(self, warning_radius_meters=50.0, prediction_horizon_seconds=10.0):
+    def __init__(self, warning_radius_meters=50.0, prediction_horizon_seconds=10.0, max_speed_mps=None):
         """
         :param warning_radius_meters: Distance threshold to trigger a warning.
         :param prediction_horizon_seconds: How many seconds into the future to check.
+        :param max_speed_mps: Fastest plausible horizontal speed. Caps the neighbour search
+            radius so a single glitched velocity can't make every pair a candidate.
+            Defaults to the fastest drone of each tick.
         """
         self.warning_radius = warning_radius_meters
         self.prediction_horizon = prediction_horizon_seconds
+        self.max_speed = max_speed_mps
         
-        # Approximate conversion factors for San Francisco (Latitude ~37)
+        # Approximate conversion factors
         # 1 deg Lat ~= 111,000 meters
-        # 1 deg Lon ~= 88,000 meters (at 37 degrees lat)
+        # 1 deg Lon ~= 111,000 * cos(lat) meters, evaluated per drone
         self.METERS_PER_DEG_LAT = 111000 
-        self.METERS_PER_DEG_LON = 88000 
 
-    def _to_cartesian(self, obj: FlyingObject, ref_lat: float, ref_lon: float) -> Tuple[float, float, float, float, float, float]:
+    def _to_cartesian(self, states: np.ndarray, ref_lat: float, ref_lon: float, cos_ref: float, sin_ref: float) -> np.ndarray:
         """
         Converts GPS (deg) + Alt (m) -> Cartesian (m) relative to a reference point.
-        Returns: (px, py, pz, vx, vy, vz) in meters and meters/second.
+        :param states: (N, 7) rows of (id, lat, lon, alt, vx, vy, vz).
+        :param cos_ref: cos of the reference latitude.
+        :param sin_ref: sin of the reference latitude.
+        Returns: (N, 6) rows of (px, py, pz, vx, vy, vz) in meters and meters/second.
         """
+        lat, lon = states[:, 1], states[:, 2]
+
+        # Tracked drones span a tiny latitude range, so cos(lat) is expanded
+        # around the reference latitude (error below 1e-10 for 0.05 deg)
+        # instead of calling cos per drone
+        dlat = np.radians(lat - ref_lat)
+        cos_lat = cos_ref - sin_ref * dlat - 0.5 * cos_ref * dlat * dlat
+        meters_per_deg_lon = self.METERS_PER_DEG_LAT * cos_lat
+
+        cartesian = np.empty((len(states), 6))
         # Position Delta in Meters
-        px = (obj.x - ref_lat) * self.METERS_PER_DEG_LAT
-        py = (obj.y - ref_lon) * self.METERS_PER_DEG_LON
-        pz = obj.altitude
+        cartesian[:, 0] = (lat - ref_lat) * self.METERS_PER_DEG_LAT
+        cartesian[:, 1] = (lon - ref_lon) * meters_per_deg_lon
+        cartesian[:, 2] = states[:, 3]
 
         # Velocity in Meters/Second (Assuming input velocity is deg/s for x/y and m/s for z)
         # Note: If your hardware provides m/s for GPS velocity, remove the multipliers below.
-        vx = obj.velocity[0] * self.METERS_PER_DEG_LAT
-        vy = obj.velocity[1] * self.METERS_PER_DEG_LON
-        vz = obj.velocity[2]
+        cartesian[:, 3] = states[:, 4] * self.METERS_PER_DEG_LAT
+        cartesian[:, 4] = states[:, 5] * meters_per_deg_lon
+        cartesian[:, 5] = states[:, 6]
 
-        return px, py, pz, vx, vy, vz
+        return cartesian
 
     def detect_collisions(self, objects: List[FlyingObject]) -> List[CollisionEvent]:
-        events = []
         if not objects or len(objects) < 2:
+            return []
+        return self.detect_collisions_array(*pack_states(objects))
+
+    def detect_collisions_array(self, ids: np.ndarray, states: np.ndarray) -> List[CollisionEvent]:
+        """
+        Same as detect_collisions, on a snapshot from ObjectManager.get_active_array.
+        :param ids: (N,) int64 object IDs.
+        :param states: (N, 7) float64 rows of (id, lat, lon, alt, vx, vy, vz).
+        """
+        events = []
+        if len(states) < 2:
             return events
 
         # Use the first object as the coordinate reference system origin
-        ref_lat = objects[0].x
-        ref_lon = objects[0].y
-
-        # Compare every unique pair
-        for i in range(len(objects)):
-            for j in range(i + 1, len(objects)):
-                obj_a = objects[i]
-                obj_b = objects[j]
-
-                # 1. Convert to local metric cartesian coordinates
-                p1x, p1y, p1z, v1x, v1y, v1z = self._to_cartesian(obj_a, ref_lat, ref_lon)
-                p2x, p2y, p2z, v2x, v2y, v2z = self._to_cartesian(obj_b, ref_lat, ref_lon)
-
-                # 2. Relative Position and Velocity
-                # dP = P2 - P1
-                dx, dy, dz = p2x - p1x, p2y - p1y, p2z - p1z
-                # dV = V2 - V1
-                dvx, dvy, dvz = v2x - v1x, v2y - v1y, v2z - v1z
-
-                # 3. Calculate Time to Closest Point of Approach (t_cpa)
-                # Formula: t = -(dP . dV) / (||dV||^2)
-                dot_product = (dx * dvx) + (dy * dvy) + (dz * dvz)
-                velocity_mag_sq = (dvx**2) + (dvy**2) + (dvz**2)
-
-                t_cpa = 0.0
-                if velocity_mag_sq > 0.0001:
-                    t_cpa = -dot_product / velocity_mag_sq
-
-                # 4. Clamp time to the future (0 to horizon)
-                # We check t=0 (now) and t=t_cpa (future closest point)
-                check_times = [0]
-                if 0 < t_cpa <= self.prediction_horizon:
-                    check_times.append(t_cpa)
-
-                min_dist = float('inf')
-                
-                for t in check_times:
-                    # Position of A at time t
-                    a_tx = p1x + v1x * t
-                    a_ty = p1y + v1y * t
-                    a_tz = p1z + v1z * t
-                    
-                    # Position of B at time t
-                    b_tx = p2x + v2x * t
-                    b_ty = p2y + v2y * t
-                    b_tz = p2z + v2z * t
-
-                    dist = math.sqrt((b_tx - a_tx)**2 + (b_ty - a_ty)**2 + (b_tz - a_tz)**2)
-                    if dist < min_dist:
-                        min_dist = dist
-
-                # 5. Check Threshold
-                if min_dist < self.warning_radius:
-                    events.append(CollisionEvent(obj_a.id, obj_b.id, t_cpa, min_dist))
-
-        return events
\ No newline at end of file
+        ref_lat = states[0, 1]
+        ref_lon = states[0, 2]
+
+        ref_rad = math.radians(ref_lat)
+        cos_ref, sin_ref = math.cos(ref_rad), math.sin(ref_rad)
+
+        # 1. Convert to local metric cartesian coordinates for all objects at once
+        cartesian = self._to_cartesian(states, ref_lat, ref_lon, cos_ref, sin_ref)
+        xs = cartesian[:, 0].tolist()
+        ys = cartesian[:, 1].tolist()
+
+        # Horizontal quad-tree over this tick's positions
+        tree = QuadTree((min(xs), min(ys), max(xs), max(ys)), max_per_node=2)
+        for index, (px, py) in enumerate(zip(xs, ys)):
+            tree.insert(px, py, index)
+
+        # Two drones close in by at most 2 * max_speed per second, so pairs further
+        # apart than this can't get within the warning radius inside the horizon
+        max_speed = float(np.hypot(cartesian[:, 3], cartesian[:, 4]).max())
+        if self.max_speed is not None:
+            max_speed = min(max_speed, self.max_speed)
+        search_radius = self.warning_radius + 2 * max_speed * self.prediction_horizon
+
+        # Candidate pairs (i < j), ordered by i then j
+        pairs_a, pairs_b = [], []
+        for i in range(len(xs)):
+            candidates = sorted(j for j in tree.query_range(xs[i], ys[i], search_radius) if j > i)
+            pairs_a.extend([i] * len(candidates))
+            pairs_b.extend(candidates)
+        if not pairs_a:
+            return events
+        a = np.array(pairs_a)
+        b = np.array(pairs_b)
+
+        # 2. Relative Position and Velocity of every pair
+        # dP = P2 - P1
+        dp = cartesian[b, :3] - cartesian[a, :3]
+        # dV = V2 - V1
+        dv = cartesian[b, 3:] - cartesian[a, 3:]
+
+        # Altitude post-filter: vertically separated pairs stay apart
+        close = np.abs(dp[:, 2]) - np.abs(dv[:, 2]) * self.prediction_horizon <= self.warning_radius
+        a, b, dp, dv = a[close], b[close], dp[close], dv[close]
+
+        # 3. Calculate Time to Closest Point of Approach (t_cpa)
+        # Formula: t = -(dP . dV) / (||dV||^2), 0 for (nearly) parallel motion
+        dot_product = np.einsum('ij,ij->i', dp, dv)
+        velocity_mag_sq = np.einsum('ij,ij->i', dv, dv)
+        moving = velocity_mag_sq > 0.0001
+        t_cpa = np.divide(-dot_product, velocity_mag_sq, out=np.zeros_like(dot_product), where=moving)
+
+        # 4. Clamp time to the future (0 to horizon)
+        # We check t=0 (now) and t=t_cpa (future closest point)
+        dist_now = np.linalg.norm(dp, axis=1)
+        in_horizon = (t_cpa > 0) & (t_cpa <= self.prediction_horizon)
+        dist_cpa = np.where(in_horizon, np.linalg.norm(dp + dv * t_cpa[:, np.newaxis], axis=1), np.inf)
+
+        # Report when the closest approach inside [0, horizon] happens, a
+        # diverging pair that is already too close is a conflict now (t=0)
+        # rather than at its negative or out of horizon t_cpa
+        later = dist_cpa < dist_now
+        min_dist = np.where(later, dist_cpa, dist_now)
+        min_time = np.where(later, t_cpa, 0.0)
+
+        # 5. Check Threshold
+        ids = ids.tolist()
+        hits = np.flatnonzero(min_dist < self.warning_radius)
+        for i, j, t, dist in zip(a[hits].tolist(), b[hits].tolist(), min_time[hits].tolist(), min_dist[hits].tolist()):
+            events.append(CollisionEvent(ids[i], ids[j], t, dist, i, j))
+
+        return events
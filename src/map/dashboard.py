@@ -1,15 +1,16 @@
 import dash
 import dash_bootstrap_components as dbc
-from dash import dcc, html, Input, Output, State, dash_table
-import plotly.express as px
+from dash import dcc, html, Input, Output, State, Patch, dash_table
 import plotly.graph_objects as go
-import pandas as pd
+import plotly.io as pio
 import math
+import itertools
 import sys
 import os
 import numpy as np
 import time
 import json
+import base64
 from flask import request, jsonify
 
 # --- SETUP PATHS ---
@@ -20,9 +21,12 @@ sys.path.append(os.path.dirname(current_dir))
 from flying_object import FlyingObject
 from object_manager import ObjectManager
 from collision_detector import CollisionDetector
-from scanning.remoteid_sniffer import run_sniffer_thread
+from scanning.remoteid_sniffer import run_sniffer_async
 
 # --- CONFIGURATION ---
+# Encode figures with orjson, which serializes numpy arrays without a Python loop
+pio.json.config.default_engine = 'orjson'
+
 config_path = '/app/config.json'
 
 try:
@@ -43,7 +47,11 @@ WIFI_INTERFACE = 'Wi-Fi'
 GRID_STATE = {
     "min": None,
     "max": None,
-    "active": False
+    "active": False,
+    # Native map layers drawing the detection grid boundary
+    "layers": [],
+    # Bumped on every boundary change so open dashboards redraw
+    "version": 0
 }
 
 SYSTEM_STATE = {
@@ -56,34 +64,97 @@ collision_detector = CollisionDetector(warning_radius_meters=150.0)
 
 # --- START SNIFFER ---
 try:
-    run_sniffer_thread(manager, interface=WIFI_INTERFACE)
+    run_sniffer_async(manager, [WIFI_INTERFACE])
     print(f"[SUCCESS] Sniffer thread started on {WIFI_INTERFACE}")
 except Exception as e:
     print(f"[ERROR] Sniffer failed: {e}")
 
 # --- SIMULATION DATA SETUP ---
 def generate_path_coordinates(steps):
-    paths = [[], [], []]
+    """
+    Returns a (3, steps, 3) array of (lat, lon, alt) for each simulated drone per frame.
+    """
     radius = 0.01 * PATH_MOVEMENT_SCALE 
-    for i in range(steps):
-        t = i / steps 
-        angle = t * 2 * np.pi
-        paths[0].append((CENTER_LAT + radius * np.sin(angle), CENTER_LON + radius * np.cos(angle), 100))
-        scale = radius * 1.5
-        d2_lat = CENTER_LAT + (scale * np.sin(angle) * np.cos(angle)) / (1 + np.sin(angle)**2)
-        d2_lon = CENTER_LON + (scale * np.cos(angle)) / (1 + np.sin(angle)**2)
-        paths[1].append((d2_lat, d2_lon, 100)) 
-        paths[2].append((CENTER_LAT + (radius * 1.5 * np.sin(angle)), CENTER_LON - 0.02, 800))
+    angle = np.arange(steps) / steps * 2 * np.pi
+    s, c = np.sin(angle), np.cos(angle)
+    lat0 = CENTER_LAT + radius * s
+    lon0 = CENTER_LON + radius * c
+    scale = radius * 1.5
+    d2_lat = CENTER_LAT + (scale * s * c) / (1 + s * s)
+    d2_lon = CENTER_LON + (scale * c) / (1 + s * s)
+    lat2 = CENTER_LAT + (radius * 1.5 * s)
+    lon2 = np.full(steps, CENTER_LON - 0.02)
+
+    paths = np.stack([
+        np.stack([lat0, lon0, np.full(steps, 100.0)], axis=-1),
+        np.stack([d2_lat, d2_lon, np.full(steps, 100.0)], axis=-1),
+        np.stack([lat2, lon2, np.full(steps, 800.0)], axis=-1),
+    ], axis=0)
     return paths
 
 path_data = generate_path_coordinates(TOTAL_FRAMES)
+
+# Precompute every simulation frame as (TOTAL_FRAMES, N_DRONES, 3) arrays
+# Velocity converts degrees per frame to approx meters per sec
+SIM_POSITIONS = path_data.transpose(1, 0, 2)
+SIM_VELOCITIES = (np.roll(SIM_POSITIONS, -1, axis=0) - SIM_POSITIONS) * np.array([111000 * 5, 88000 * 5, 5])
 current_time = int(time.time())
+# Sequential IDs for simulated drones
+sim_ids = itertools.count(101)
 simulated_drones = [
-    FlyingObject.create_with_id(101, CENTER_LAT, CENTER_LON, 100.0, 0.0, 0.0, 0.0, current_time),
-    FlyingObject.create_with_id(102, CENTER_LAT, CENTER_LON, 100.0, 0.0, 0.0, 0.0, current_time),
-    FlyingObject.create_with_id(103, CENTER_LAT, CENTER_LON, 800.0, 0.0, 0.0, 0.0, current_time)
+    FlyingObject.create_with_id(next(sim_ids), CENTER_LAT, CENTER_LON, 100.0, 0.0, 0.0, 0.0, current_time),
+    FlyingObject.create_with_id(next(sim_ids), CENTER_LAT, CENTER_LON, 100.0, 0.0, 0.0, 0.0, current_time),
+    FlyingObject.create_with_id(next(sim_ids), CENTER_LAT, CENTER_LON, 800.0, 0.0, 0.0, 0.0, current_time)
 ]
 
+def make_boundary_layers(min_p, max_p):
+    """
+    Builds the detection grid outline as a GeoJSON line layer so the map
+    renders it natively instead of redrawing a trace every update.
+    """
+    if not min_p or not max_p:
+        return []
+    geojson_boundary = {
+        "type": "Feature",
+        "geometry": {
+            "type": "LineString",
+            "coordinates": [
+                [min_p[0], min_p[1]], [min_p[0], max_p[1]], [max_p[0], max_p[1]],
+                [max_p[0], min_p[1]], [min_p[0], min_p[1]]
+            ]
+        }
+    }
+    return [{
+        "sourcetype": "geojson", "source": geojson_boundary, "type": "line",
+        "color": "#00FF00", "line": {"width": 2, "dash": [2, 2]}
+    }]
+
+def make_base_figure():
+    """
+    Builds the map figure skeleton once. Updates only patch the trace data
+    and view into it (trace 0 drones, trace 1 trails).
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scattermap(
+        lat=[], lon=[], mode='markers', name='Drones',
+        marker=dict(
+            size=15, color=[], colorscale='Viridis', cmin=0, cmax=800,
+            showscale=True, colorbar=dict(title='alt')
+        ),
+        hovertemplate='<b>%{hovertext}</b><br>alt=%{marker.color:.1f}<br>speed=%{customdata}<extra></extra>'
+    ))
+    fig.add_trace(go.Scattermap(
+        lat=[], lon=[], mode='lines',
+        line=dict(width=2, color='cyan'), name='Trail (5s)'
+    ))
+    fig.update_layout(
+        map=dict(style="carto-darkmatter", center=dict(lat=CENTER_LAT, lon=CENTER_LON), zoom=13),
+        margin={"r":0, "t":0, "l":0, "b":0}, showlegend=False, uirevision='constant'
+    )
+    return fig
+
+BASE_FIGURE = make_base_figure()
+
 # --- DASHBOARD APP ---
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.DARKLY])
 server = app.server 
@@ -96,6 +167,9 @@ def update_parameters():
         GRID_STATE["min"] = data.get("grid_min")
         GRID_STATE["max"] = data.get("grid_max")
         GRID_STATE["active"] = True
+        GRID_STATE["layers"] = make_boundary_layers(GRID_STATE["min"], GRID_STATE["max"])
+        # Force the next update to redraw with the new boundary
+        GRID_STATE["version"] += 1
         return jsonify({"status": "success"}), 200
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -104,12 +178,19 @@ def update_parameters():
 def stream_objects():
     try:
         data = request.get_json()
-        if not data or 'objects' not in data:
+        if not data or ('objects' not in data and 'state' not in data):
             return jsonify({"status": "error"}), 400
+
+        # Packed (N, 7) float64 fleet buffer: (id, lat, lon, alt, vx, vy, vz)
+        if 'state' in data:
+            state = np.frombuffer(base64.b64decode(data['state']), dtype='<f8').reshape(-1, 7)
+            for obj_id, lat, lon, alt, vx, vy, vz in state.tolist():
+                manager.update_object(id=int(obj_id), lat=lat, lon=lon, alt=alt, vx=vx, vy=vy, vz=vz)
+            return jsonify({"status": "success"}), 200
             
         for obj in data['objects']:
             manager.update_object(
-                id=obj.get('id'),
+                id=int(obj.get('id')),
                 lat=obj.get('lat', 0.0),
                 lon=obj.get('lon', 0.0),
                 alt=obj.get('alt', 0.0),
@@ -124,12 +205,14 @@ def stream_objects():
 # --- LAYOUT ---
 app.layout = dbc.Container([
     dcc.Store(id='filter-store', data=0),
+    # (manager revision, grid version) shown by this client's last live frame
+    dcc.Store(id='rendered-revision'),
     dbc.Row([dbc.Col(html.H2("VDAWS Live Tracker", className="text-center text-primary mb-4"), width=12)], className="mt-3"),
     dbc.Row([
         dbc.Col([
             dbc.Card([
                 dbc.CardHeader(["Live Airspace ", html.Span(id='live-badge', className="badge bg-secondary")]),
-                dbc.CardBody([dcc.Graph(id='map-graph', style={'height': '70vh'})], style={'padding': '0'}) 
+                dbc.CardBody([dcc.Graph(id='map-graph', figure=BASE_FIGURE, style={'height': '70vh'})], style={'padding': '0'}) 
             ])
         ], width=8),
         dbc.Col([
@@ -184,7 +267,7 @@ def handle_inputs(v_clicks, r_clicks, v_value):
     
     if button_id == 'reset-sim-btn':
         # Clear the manager and reset the persistent flag
-        manager.objects.clear()
+        manager.clear()
         SYSTEM_STATE["has_received_live_data"] = False
         return 0
         
@@ -196,17 +279,28 @@ def handle_inputs(v_clicks, r_clicks, v_value):
      Output('status-indicator', 'children'),
      Output('collision-alert', 'children'),
      Output('live-badge', 'children'),
-     Output('live-badge', 'className')],
+     Output('live-badge', 'className'),
+     Output('rendered-revision', 'data')],
     [Input('interval-component', 'n_intervals'),
-     Input('filter-store', 'data')] 
+     Input('filter-store', 'data')],
+    State('rendered-revision', 'data')
 )
-def update_dashboard(n, min_velocity):
+def update_dashboard(n, min_velocity, rendered):
+    # Read the revision first so a concurrent update is never skipped
+    revision = manager.revision
     active_objects = manager.get_active_objects()
     
     # Stay in Live Mode if data was ever seen
     if active_objects or SYSTEM_STATE["has_received_live_data"]:
         if active_objects:
             SYSTEM_STATE["has_received_live_data"] = True
+
+        # Interval tick with no new data, keep everything as it is. The
+        # first call of a client has nothing rendered yet and always draws
+        shown = [revision, GRID_STATE["version"]]
+        triggered_by_interval = dash.callback_context.triggered_id == 'interval-component'
+        if triggered_by_interval and rendered is not None and rendered == shown:
+            return (dash.no_update,) * 7
             
         status_text, status_color = f"● LIVE TRACKING ({len(active_objects)} detected)", "#00ff00"
         badge_text, badge_class = "LIVE", "badge bg-danger ms-2"
@@ -214,63 +308,50 @@ def update_dashboard(n, min_velocity):
         is_live = True
     else:
         # Fallback to simulation
-        frame_idx, next_frame_idx = int(n) % TOTAL_FRAMES, (int(n) + 1) % TOTAL_FRAMES
-        for i, drone in enumerate(simulated_drones):
-            target_pos, future_pos = path_data[i][frame_idx], path_data[i][next_frame_idx]
-            dx, dy, dz = (future_pos[0] - target_pos[0]) * 111000, (future_pos[1] - target_pos[1]) * 88000, (future_pos[2] - target_pos[2])
-            drone.set_position(target_pos[0], target_pos[1], target_pos[2])
-            drone.set_velocity(dx * 5, dy * 5, dz * 5)
+        frame_idx = int(n) % TOTAL_FRAMES
+        positions = SIM_POSITIONS[frame_idx].tolist()
+        velocities = SIM_VELOCITIES[frame_idx].tolist()
+        for drone, (x, y, alt), (vx, vy, vz) in zip(simulated_drones, positions, velocities):
+            drone.set_position(x, y, alt)
+            drone.set_velocity(vx, vy, vz)
         
         active_objects = simulated_drones
         visible_objects = [obj for obj in active_objects if obj.average_speed >= min_velocity]
+        shown = None
         status_text, status_color = "● SIMULATION MODE", "#ffaa00" 
         badge_text, badge_class = "SIM", "badge bg-warning text-dark ms-2"
         is_live = False
 
     collision_events = collision_detector.detect_collisions(active_objects)
     
-    node_data, trail_lats, trail_lons = [], [], []
+    node_lat = [obj.x for obj in visible_objects]
+    node_lon = [obj.y for obj in visible_objects]
+    node_alt = [obj.altitude for obj in visible_objects]
+
+    trail_lats, trail_lons = [], []
     for obj in visible_objects:
-        node_data.append({
-            'lat': obj.x, 'lon': obj.y, 'alt': obj.altitude,
-            'id': f"ID:{obj.id}", 'size': 15, 'speed': f"{obj.average_speed:.1f} m/s"
-        })
         t_lats, t_lons = obj.get_trail_coordinates()
         if t_lats:
             trail_lats.extend(t_lats + [None]) 
             trail_lons.extend(t_lons + [None])
-    
-    df_nodes = pd.DataFrame(node_data)
-    center_lat = df_nodes['lat'].mean() if is_live and not df_nodes.empty else CENTER_LAT
-    center_lon = df_nodes['lon'].mean() if is_live and not df_nodes.empty else CENTER_LON
-    zoom_level = 15 if is_live and not df_nodes.empty else 13
 
-    if df_nodes.empty:
-        fig = px.scatter_map(lat=[CENTER_LAT], lon=[CENTER_LON], zoom=zoom_level)
+    # Only the changing parts of BASE_FIGURE are sent to the browser
+    fig = Patch()
+    fig['data'][0]['lat'] = node_lat
+    fig['data'][0]['lon'] = node_lon
+    fig['data'][0]['marker']['color'] = node_alt
+    fig['data'][0]['hovertext'] = [f"ID:{obj.id}" for obj in visible_objects]
+    fig['data'][0]['customdata'] = [f"{obj.average_speed:.1f} m/s" for obj in visible_objects]
+    fig['data'][1]['lat'] = trail_lats
+    fig['data'][1]['lon'] = trail_lons
+
+    if is_live and visible_objects:
+        fig['layout']['map']['center'] = {"lat": sum(node_lat) / len(node_lat), "lon": sum(node_lon) / len(node_lon)}
+        fig['layout']['map']['zoom'] = 15
     else:
-        fig = px.scatter_map(
-            df_nodes, lat="lat", lon="lon", color="alt", size="size",
-            size_max=15, zoom=zoom_level, hover_name="id", hover_data=["speed"],
-            color_continuous_scale="Viridis", range_color=[0, 800],
-            center={"lat": center_lat, "lon": center_lon}
-        )
-
-    if GRID_STATE["active"] and GRID_STATE["min"] and GRID_STATE["max"]:
-        min_p, max_p = GRID_STATE["min"], GRID_STATE["max"]
-        fig.add_trace(go.Scattermap(
-            lat=[min_p[1], max_p[1], max_p[1], min_p[1], min_p[1]],
-            lon=[min_p[0], min_p[0], max_p[0], max_p[0], min_p[0]],
-            mode='lines', line=dict(width=2, color='#00FF00', dash='dot'), 
-            name='Detection Grid'
-        ))
-
-    if trail_lats:
-        fig.add_trace(go.Scattermap(
-            lat=trail_lats, lon=trail_lons, mode='lines',
-            line=dict(width=2, color='cyan'), name='Trail (5s)'
-        ))
-
-    fig.update_layout(map_style="carto-darkmatter", margin={"r":0, "t":0, "l":0, "b":0}, showlegend=False, uirevision='constant')
+        fig['layout']['map']['center'] = {"lat": CENTER_LAT, "lon": CENTER_LON}
+        fig['layout']['map']['zoom'] = 13
+    fig['layout']['map']['layers'] = GRID_STATE["layers"] if GRID_STATE["active"] else []
 
     table_data = [{"id": str(obj.id), "alt": f"{obj.altitude:.1f}", "spd": f"{obj.average_speed:.1f}"} for obj in visible_objects]
     status_html = html.Span(status_text, style={'color': status_color, 'fontWeight': 'bold'})
@@ -279,7 +360,7 @@ def update_dashboard(n, min_velocity):
     if collision_events:
         alert_html = html.Div(f"WARNING: {len(collision_events)} Potential Collisions!", style={'color': 'red', 'fontWeight': 'bold'})
 
-    return fig, table_data, status_html, alert_html, badge_text, badge_class
+    return fig, table_data, status_html, alert_html, badge_text, badge_class, shown
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', debug=True, port=8050)
\ No newline at end of file
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import Tuple, List
 import time
 import math
+import numpy as np
 
 @dataclass
 class ObjectData:
@@ -88,4 +89,16 @@ class FlyingObject:
     
     @classmethod
     def create_with_id(cls, id: int, x: float, y: float, altitude: float, vx: float, vy: float, vz: float, initial_time: int):
-        return cls(id, (x, y, altitude), (vx, vy, vz), initial_time)
\ No newline at end of file
+        return cls(id, (x, y, altitude), (vx, vy, vz), initial_time)
+
+def pack_states(objects: List[FlyingObject]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Packs objects into a parallel int64 ID array and a contiguous (N, 7)
+    float64 array with columns (id, lat, lon, alt, vx, vy, vz).
+    """
+    states = np.array(
+        [(obj.id, *obj.position, *obj.velocity) for obj in objects], dtype=np.float64
+    ).reshape(-1, 7)
+    # Read the IDs separately, float64 rounds IDs above 2**53
+    ids = np.fromiter((obj.id for obj in objects), dtype=np.int64, count=len(objects))
+    return ids, states
@@ -1,13 +1,14 @@
 import dash
-from dash import dcc, html, Input, Output
-import plotly.express as px
+from dash import dcc, html, Input, Output, State, ClientsideFunction
+from dash_extensions import EventSource
+from flask import Response
 import plotly.graph_objects as go
-import pandas as pd
-import math
+import plotly.io as pio
+import itertools
+import hashlib
 import sys
 import os
 import numpy as np
-import uuid
 import time
 
 # --- IMPORT PATH FIX ---
@@ -17,50 +18,149 @@ sys.path.append(project_root)
 
 # Local Imports
 from src.map.object_manager import ObjectManager
-from src.map.flying_object import FlyingObject
-from src.scanning.remoteid_sniffer import run_sniffer_thread
+from src.scanning.remoteid_sniffer import run_sniffer_async
 # --- NEW IMPORT ---
 from src.map.collision_detector import CollisionDetector
 
 # --- CONFIGURATION ---
+# Encode figures with orjson, which serializes numpy arrays without a Python loop
+pio.json.config.default_engine = 'orjson'
+
 WIFI_INTERFACE = 'Wi-Fi' 
 CENTER_LAT = 37.76
 CENTER_LON = -122.43
 TOTAL_FRAMES = 100
 PATH_MOVEMENT_SCALE = 1.5 
+# Server state (detection) and browser render (extrapolation) run on separate ticks
+SERVER_TICK_MS = 1000
+RENDER_TICK_MS = 200
+# Quantization of (lat, lon, alt, vx, vy) for the state fingerprint, finer
+# changes are not visible on the map
+FINGERPRINT_STEP = np.array([1e-6, 1e-6, 0.1, 1e-7, 1e-7])
+# Live velocities are meters/second (vx East, vy North)
+METERS_PER_DEG_LAT = 111320.0
 
 # --- 1. SETUP ---
 manager = ObjectManager(timeout_seconds=5)
-# run_sniffer_thread(manager, interface=WIFI_INTERFACE) # Uncomment for live
+# run_sniffer_async(manager, [WIFI_INTERFACE]) # Uncomment for live
 
 # Initialize Collision Detector (50m radius, look 10s into future)
 collision_detector = CollisionDetector(warning_radius_meters=150.0, prediction_horizon_seconds=10.0)
 
 # --- 2. SIMULATION DATA ---
 def generate_path_coordinates(steps):
-    paths = [[], [], []]
+    """
+    Returns a (3, steps, 3) array of (lat, lon, alt) for each simulated drone per frame.
+    """
     radius = 0.01 * PATH_MOVEMENT_SCALE 
-    for i in range(steps):
-        t = i / steps 
-        angle = t * 2 * np.pi
-        paths[0].append((CENTER_LAT + radius * np.sin(angle), CENTER_LON + radius * np.cos(angle), 100))
-        scale = radius * 1.5
-        d2_lat = CENTER_LAT + (scale * np.sin(angle) * np.cos(angle)) / (1 + np.sin(angle)**2)
-        d2_lon = CENTER_LON + (scale * np.cos(angle)) / (1 + np.sin(angle)**2)
-        paths[1].append((d2_lat, d2_lon, 100)) # Changed alt to 100 to force collision for demo
-        paths[2].append((CENTER_LAT + (radius * 1.5 * np.sin(angle)), CENTER_LON - 0.02, 800))
+    angle = np.arange(steps) / steps * 2 * np.pi
+    s, c = np.sin(angle), np.cos(angle)
+    lat0 = CENTER_LAT + radius * s
+    lon0 = CENTER_LON + radius * c
+    scale = radius * 1.5
+    d2_lat = CENTER_LAT + (scale * s * c) / (1 + s * s)
+    d2_lon = CENTER_LON + (scale * c) / (1 + s * s)
+    lat2 = CENTER_LAT + (radius * 1.5 * s)
+    lon2 = np.full(steps, CENTER_LON - 0.02)
+
+    paths = np.stack([
+        np.stack([lat0, lon0, np.full(steps, 100.0)], axis=-1),
+        np.stack([d2_lat, d2_lon, np.full(steps, 100.0)], axis=-1), # Changed alt to 100 to force collision for demo
+        np.stack([lat2, lon2, np.full(steps, 800.0)], axis=-1),
+    ], axis=0)
     return paths
 
 path_data = generate_path_coordinates(TOTAL_FRAMES)
-current_time = int(time.time())
-simulated_drones = [
-    FlyingObject.create_with_id(101, CENTER_LAT, CENTER_LON, 100.0, 0.0, 0.0, 0.0, current_time),
-    FlyingObject.create_with_id(102, CENTER_LAT, CENTER_LON, 100.0, 0.0, 0.0, 0.0, current_time),
-    FlyingObject.create_with_id(103, CENTER_LAT, CENTER_LON, 800.0, 0.0, 0.0, 0.0, current_time)
-]
+
+# Precompute every simulation frame as (TOTAL_FRAMES, N_DRONES, 7) state arrays
+# with the same (id, lat, lon, alt, vx, vy, vz) layout as ObjectManager.get_active_array
+# Velocity is degrees per frame -> approx degrees per sec at 5 fps
+SIM_FPS = 5.0
+SIM_POSITIONS = path_data.transpose(1, 0, 2)
+SIM_VELOCITIES = (np.roll(SIM_POSITIONS, -1, axis=0) - SIM_POSITIONS) * SIM_FPS
+# Sequential IDs for simulated drones
+sim_ids = itertools.count(101)
+SIM_IDS = np.array([next(sim_ids) for _ in range(SIM_POSITIONS.shape[1])], dtype=np.int64)
+SIM_STATES = np.concatenate((
+    np.broadcast_to(SIM_IDS[np.newaxis, :, np.newaxis], (TOTAL_FRAMES, len(SIM_IDS), 1)),
+    SIM_POSITIONS,
+    SIM_VELOCITIES
+), axis=2)
+
+def make_base_figure():
+    """
+    Builds the map figure once. The clientside renderer (assets/vdaws.js) only
+    replaces the trace coordinates: trace 0 holds the drones, 1 the heading
+    arrows and 2 the collision lines.
+    """
+    fig = go.Figure()
+
+    # Layer: Drones (colored by altitude)
+    fig.add_trace(go.Scattermapbox(
+        lat=[], lon=[], hovertext=[],
+        mode='markers',
+        marker=go.scattermapbox.Marker(
+            size=15, color=[], colorscale='Jet', cmin=0, cmax=500,
+            showscale=True, colorbar=dict(title='alt')
+        ),
+        hovertemplate='<b>%{hovertext}</b><br>lat=%{lat}<br>lon=%{lon}<br>alt=%{marker.color}<extra></extra>',
+        name='Drones'
+    ))
+
+    # Layer: Direction Arrows
+    fig.add_trace(go.Scattermapbox(
+        lat=[], lon=[],
+        mode='markers', marker=go.scattermapbox.Marker(size=8, color='white'),
+        hoverinfo='skip', name='Heading'
+    ))
+
+    # Layer: Collision Lines (Red)
+    fig.add_trace(go.Scattermapbox(
+        lat=[], lon=[],
+        mode='lines',
+        line=dict(width=4, color='red'),
+        hoverinfo='skip', name='Collision Course'
+    ))
+
+    fig.update_layout(
+        mapbox=dict(style="open-street-map", zoom=13, center=dict(lat=CENTER_LAT, lon=CENTER_LON)),
+        margin={"r":0, "t":0, "l":0, "b":0},
+        showlegend=False,
+        uirevision='constant_loop'
+    )
+    return fig
+
+def state_fingerprint(is_live, ids, quantized, collisions):
+    """
+    Digest of a published state. Unlike hash() it is stable across server
+    processes, so it can be kept in the client's store.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(b'L' if is_live else b'S')
+    digest.update(ids.tobytes())
+    digest.update(quantized.tobytes())
+    digest.update(np.asarray(collisions, dtype=np.int64).tobytes())
+    return digest.hexdigest()
 
 # --- DASH APP ---
 app = dash.Dash(__name__)
+server = app.server
+
+# --- PUSH UPDATES ---
+@server.route('/object_events')
+def object_events():
+    """
+    Server-sent events stream that emits the manager revision whenever an
+    object is updated. Sends a heartbeat every second so timed out objects
+    are still cleaned up while nothing is transmitting.
+    """
+    def event_generator():
+        revision = manager.revision
+        while True:
+            revision = manager.wait_for_change(revision, timeout=1.0)
+            # SSE format is 'data: <contents>\n\n'
+            yield f'data: {revision}\n\n'
+    return Response(event_generator(), mimetype='text/event-stream')
 
 app.layout = html.Div([
     html.Div([
@@ -69,129 +169,99 @@ app.layout = html.Div([
         html.Div(id='collision-alert', style={'color': 'red', 'fontWeight': 'bold', 'marginTop': '5px'})
     ], style={'position': 'absolute', 'z-index': '10', 'left': '20px', 'top': '20px', 'backgroundColor': 'rgba(0,0,0,0.6)', 'padding': '15px', 'borderRadius': '5px'}),
 
-    dcc.Graph(id='map-graph', style={'height': '100vh'}),
-    dcc.Interval(id='interval-component', interval=200, n_intervals=0),
+    dcc.Graph(id='map-graph', figure=make_base_figure(), style={'height': '100vh'}),
+    # Drone state and collision pairs published by the server for the clientside renderer
+    dcc.Store(id='drone-state'),
+    # Manager revision shown by this client's last live frame
+    dcc.Store(id='rendered-revision'),
+    # Fingerprint of the last state published to this client
+    dcc.Store(id='rendered-fingerprint'),
+    # Drives the simulation, disabled while live updates are pushed
+    dcc.Interval(id='interval-component', interval=SERVER_TICK_MS, n_intervals=0),
+    # Browser-only tick that extrapolates positions between server states
+    dcc.Interval(id='render-interval', interval=RENDER_TICK_MS, n_intervals=0),
+    EventSource(id='object-events', url='/object_events'),
 ])
 
 @app.callback(
-    [Output('map-graph', 'figure'),
+    [Output('drone-state', 'data'),
      Output('status-indicator', 'children'),
      Output('status-indicator', 'style'),
-     Output('collision-alert', 'children')],
-    Input('interval-component', 'n_intervals')
+     Output('collision-alert', 'children'),
+     Output('interval-component', 'disabled'),
+     Output('rendered-revision', 'data'),
+     Output('rendered-fingerprint', 'data')],
+    [Input('interval-component', 'n_intervals'),
+     Input('object-events', 'message')],
+    [State('rendered-revision', 'data'),
+     State('rendered-fingerprint', 'data')]
 )
-def update_map(n):
-    # 1. Get Objects (Live or Sim)
-    active_objects = manager.get_active_objects()
+def update_state(n, message, rendered_revision, rendered_fingerprint):
+    # 1. Get Objects (Live or Sim) as (id, lat, lon, alt, vx, vy, vz) rows
+    # Read the revision first so a concurrent update is never skipped
+    revision = manager.revision
+    ids, states = manager.get_active_array()
     mode_text = "MODE: LIVE TRACKING"
     mode_style = {'color': '#00ff00', 'fontWeight': 'bold'}
+    is_live = len(ids) > 0
 
-    if not active_objects:
+    if is_live:
+        # Nothing changed since the last live frame, keep the current state.
+        # The first call of a client has nothing rendered yet and always draws
+        if rendered_revision is not None and revision == rendered_revision:
+            return (dash.no_update,) * 7
+    else:
+        revision = None
         mode_text = "MODE: SIMULATION"
         mode_style = {'color': '#ffaa00', 'fontWeight': 'bold'}
         
-        frame_idx = int(n) % TOTAL_FRAMES
-        next_frame_idx = (int(n) + 1) % TOTAL_FRAMES
-        
-        for i, drone in enumerate(simulated_drones):
-            target_pos = path_data[i][frame_idx]
-            future_pos = path_data[i][next_frame_idx]
-            
-            # Calculate simulated velocity (Degrees per frame -> approx Degrees per sec)
-            fps = 5.0
-            vx = (future_pos[0] - target_pos[0]) * fps 
-            vy = (future_pos[1] - target_pos[1]) * fps
-            vz = (future_pos[2] - target_pos[2]) * fps
-            
-            drone.set_position(target_pos[0], target_pos[1], target_pos[2])
-            drone.set_velocity(vx, vy, vz)
-            
-        active_objects = simulated_drones
+        # Follow the wall clock so the loop keeps SIM_FPS regardless of the tick rate
+        ids = SIM_IDS
+        states = SIM_STATES[int(time.time() * SIM_FPS) % TOTAL_FRAMES]
+
+    lats, lons, alts = states[:, 1], states[:, 2], states[:, 3]
 
     # 2. RUN COLLISION DETECTION
-    collision_events = collision_detector.detect_collisions(active_objects)
+    collision_events = collision_detector.detect_collisions_array(ids, states)
     
-    alert_text = ""
-    collision_lines_lat = []
-    collision_lines_lon = []
+    # Pairs of rows to draw line segments between
+    collisions = [(event.row_a, event.row_b) for event in collision_events]
+
+    # Drones hovering in place still bump the revision, skip states that
+    # would render identically
+    quantized = np.round(states[:, 1:6] / FINGERPRINT_STEP).astype(np.int64)
+    fingerprint = state_fingerprint(is_live, ids, quantized, collisions)
+    if fingerprint == rendered_fingerprint:
+        return (dash.no_update,) * 5 + (revision, dash.no_update)
 
+    alert_text = ""
     if collision_events:
         alert_text = f"⚠️ COLLISION WARNING: {len(collision_events)} Predicted!"
-        
-        # Create line segments between colliding drones
-        obj_map = {obj.id: obj for obj in active_objects}
-        for event in collision_events:
-            if event.drone_a_id in obj_map and event.drone_b_id in obj_map:
-                d1 = obj_map[event.drone_a_id]
-                d2 = obj_map[event.drone_b_id]
-                
-                # Add line segment (with None to break connection between different pairs)
-                collision_lines_lat.extend([d1.x, d2.x, None])
-                collision_lines_lon.extend([d1.y, d2.y, None])
-
-    # 3. Prepare Visuals
-    node_data = []
-    arrow_data = []
-    ARROW_OFFSET = 0.00025 
-
-    for obj in active_objects:
-        node_data.append({
-            'lat': obj.x, 'lon': obj.y, 'alt': obj.altitude,
-            'id': f"ID:{obj.id}", 'size': 15
-        })
-
-        # Visualization for direction vectors
-        speed_mag = math.sqrt(obj.velocity[0]**2 + obj.velocity[1]**2)
-        if speed_mag > 0.0:
-            norm_vx = obj.velocity[0] / speed_mag
-            norm_vy = obj.velocity[1] / speed_mag
-            # Correct vector orientation for visual map (lat is Y, lon is X)
-            head_lat = obj.x + (norm_vx * ARROW_OFFSET) 
-            head_lon = obj.y + (norm_vy * ARROW_OFFSET)
-            
-            arrow_data.append({'lat': head_lat, 'lon': head_lon, 'size': 8})
-
-    df_nodes = pd.DataFrame(node_data)
-    
-    # Base Map
-    if df_nodes.empty:
-        fig = px.scatter_mapbox(lat=[CENTER_LAT], lon=[CENTER_LON], zoom=12)
-    else:
-        center_lat = df_nodes.iloc[0]['lat']
-        center_lon = df_nodes.iloc[0]['lon']
-        fig = px.scatter_mapbox(
-            df_nodes, lat="lat", lon="lon", color="alt", size="size",
-            size_max=15, zoom=13, hover_name="id",
-            color_continuous_scale="Jet", range_color=[0, 500],
-            center={"lat": center_lat, "lon": center_lon}
-        )
 
-    # Layer: Direction Arrows
-    if arrow_data:
-        df_arrows = pd.DataFrame(arrow_data)
-        fig.add_trace(go.Scattermapbox(
-            lat=df_arrows['lat'], lon=df_arrows['lon'],
-            mode='markers', marker=go.scattermapbox.Marker(size=8, color='white'),
-            hoverinfo='skip', name='Heading'
-        ))
-
-    # Layer: Collision Lines (Red)
-    if collision_lines_lat:
-        fig.add_trace(go.Scattermapbox(
-            lat=collision_lines_lat, lon=collision_lines_lon,
-            mode='lines',
-            line=dict(width=4, color='red'),
-            hoverinfo='skip', name='Collision Course'
-        ))
-
-    fig.update_layout(
-        mapbox_style="open-street-map",
-        margin={"r":0, "t":0, "l":0, "b":0},
-        showlegend=False,
-        uirevision='constant_loop'
-    )
+    # 3. Publish raw state, the browser computes headings and collision lines.
+    # Velocities go out in degrees per second along lat and lon
+    if is_live:
+        vlat = states[:, 5] / METERS_PER_DEG_LAT
+        vlon = states[:, 4] / (METERS_PER_DEG_LAT * np.cos(np.radians(lats)))
+    else:
+        # Simulated velocities are already degrees per second in (lat, lon) order
+        vlat, vlon = states[:, 4], states[:, 5]
+    state = {
+        'ids': ids, 'lat': lats, 'lon': lons, 'alt': alts,
+        'vlat': vlat, 'vlon': vlon,
+        'collisions': collisions
+    }
     
-    return fig, mode_text, mode_style, alert_text
+    # Live frames are pushed through object-events, only simulate on a timer
+    return state, mode_text, mode_style, alert_text, is_live, revision, fingerprint
+
+app.clientside_callback(
+    ClientsideFunction(namespace='vdaws', function_name='render'),
+    Output('map-graph', 'figure'),
+    Input('drone-state', 'data'),
+    Input('render-interval', 'n_intervals'),
+    State('map-graph', 'figure')
+)
 
 if __name__ == '__main__':
     app.run(debug=True, use_reloader=False)
\ No newline at end of file
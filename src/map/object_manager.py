@@ -1,30 +1,37 @@
 import threading
 import time
-from typing import Dict, List
-from flying_object import FlyingObject
+import numpy as np
+from typing import Dict, List, Tuple
+from flying_object import FlyingObject, pack_states
 
 class ObjectManager:
     def __init__(self, timeout_seconds: int = 10):
         self.objects: Dict[int, FlyingObject] = {}
         self.lock = threading.Lock()
         self.timeout_seconds = timeout_seconds
+        # Incremented whenever the set of objects or their state changes
+        self.revision = 0
+        # Notified on every revision change so listeners don't have to poll
+        self.changed = threading.Condition(self.lock)
 
-    def update_object(self, id: str, lat: float, lon: float, alt: float, vx: float, vy: float, vz: float):
+    def clear(self):
+        """
+        Removes every tracked object.
+        """
+        with self.lock:
+            self.objects.clear()
+            self.revision += 1
+            self.changed.notify_all()
+
+    def update_object(self, id: int, lat: float, lon: float, alt: float, vx: float, vy: float, vz: float):
         """
         Updates an existing object or creates a new one.
+        Callers map their own identifiers to integer IDs.
         Thread-safe.
         """
         with self.lock:
             current_time = int(time.time())
-            
-            # Convert ID to integer if your FlyingObject requires it, 
-            # otherwise hash the string ID to an int for compatibility
-            try:
-                # Try to use raw ID if it's numeric
-                obj_id = int(id)
-            except ValueError:
-                # If ID is a string (e.g. "Drone-A"), create a consistent integer hash
-                obj_id = hash(id) & ((1<<32)-1)
+            obj_id = id
 
             if obj_id in self.objects:
                 # Update existing object
@@ -40,27 +47,59 @@ class ObjectManager:
                     initial_time=current_time
                 )
                 self.objects[obj_id] = new_obj
-                print(f"[ObjectManager] New Object Detected: {id} (Mapped to ID: {obj_id})")
+                print(f"[ObjectManager] New Object Detected: {obj_id}")
+
+            self.revision += 1
+            self.changed.notify_all()
+
+    def wait_for_change(self, last_revision: int, timeout: float) -> int:
+        """
+        Blocks until the revision differs from last_revision or the timeout expires.
+        Returns the current revision.
+        """
+        with self.changed:
+            self.changed.wait_for(lambda: self.revision != last_revision, timeout)
+            return self.revision
 
     def get_active_objects(self) -> List[FlyingObject]:
         """
         Returns list of active objects and cleans up old ones.
         """
         with self.lock:
-            current_time = int(time.time())
-            active_list = []
-            expired_ids = []
+            return self._collect_active()
+
+    def get_active_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns an atomic snapshot of the active objects as a parallel int64 ID
+        array and a contiguous (N, 7) float64 array of (id, lat, lon, alt, vx, vy, vz).
+        Cleans up old objects like get_active_objects.
+        """
+        # Packed under the lock so no row mixes a new position with an old velocity
+        with self.lock:
+            return pack_states(self._collect_active())
+
+    def _collect_active(self) -> List[FlyingObject]:
+        """
+        Collects active objects and removes timed out ones. Caller must hold the lock.
+        """
+        current_time = int(time.time())
+        active_list = []
+        expired_ids = []
+
+        for obj_id, obj in self.objects.items():
+            # Check for timeout (e.g. hasn't been seen in 10 seconds)
+            if (current_time - obj.lastHeartbeat) > self.timeout_seconds:
+                expired_ids.append(obj_id)
+            else:
+                active_list.append(obj)
+        
+        # Cleanup expired objects
+        for obj_id in expired_ids:
+            print(f"[ObjectManager] Object {obj_id} timed out.")
+            del self.objects[obj_id]
 
-            for obj_id, obj in self.objects.items():
-                # Check for timeout (e.g. hasn't been seen in 10 seconds)
-                if (current_time - obj.lastHeartbeat) > self.timeout_seconds:
-                    expired_ids.append(obj_id)
-                else:
-                    active_list.append(obj)
+        if expired_ids:
+            self.revision += 1
+            self.changed.notify_all()
             
-            # Cleanup expired objects
-            for obj_id in expired_ids:
-                print(f"[ObjectManager] Object {obj_id} timed out.")
-                del self.objects[obj_id]
-                
-            return active_list
\ No newline at end of file
+        return active_list
@@ -0,0 +1,84 @@
+from typing import Any, List, Tuple
+
+class QuadTree:
+    def __init__(self, bbox: Tuple[float, float, float, float], max_per_node: int = 2, max_depth: int = 16, _depth: int = 0):
+        """
+        Point quad-tree over a horizontal plane.
+        :param bbox: (min_x, min_y, max_x, max_y) covered by this node.
+        :param max_per_node: Points a leaf holds before it is split into quadrants.
+        :param max_depth: Leaves at this depth are never split (guards against coincident points).
+        """
+        self.bbox = bbox
+        self.max_per_node = max_per_node
+        self.max_depth = max_depth
+        self.depth = _depth
+        # (x, y, item) entries, only used while this node is a leaf
+        self.points: List[Tuple[float, float, Any]] = []
+        self.children: List['QuadTree'] | None = None
+
+    def _contains(self, x: float, y: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        return min_x <= x <= max_x and min_y <= y <= max_y
+
+    def _split(self):
+        min_x, min_y, max_x, max_y = self.bbox
+        mid_x = (min_x + max_x) / 2
+        mid_y = (min_y + max_y) / 2
+        self.children = [
+            QuadTree(bbox, self.max_per_node, self.max_depth, self.depth + 1)
+            for bbox in (
+                (min_x, min_y, mid_x, mid_y),
+                (mid_x, min_y, max_x, mid_y),
+                (min_x, mid_y, mid_x, max_y),
+                (mid_x, mid_y, max_x, max_y),
+            )
+        ]
+
+        # Push the stored points down into the new quadrants
+        for x, y, item in self.points:
+            self._insert_child(x, y, item)
+        self.points = []
+
+    def _insert_child(self, x: float, y: float, item: Any):
+        for child in self.children:
+            if child.insert(x, y, item):
+                return
+
+    def insert(self, x: float, y: float, item: Any) -> bool:
+        """
+        Stores item at (x, y). Returns False if the point is outside the tree's bbox.
+        """
+        if not self._contains(x, y):
+            return False
+
+        if self.children is not None:
+            self._insert_child(x, y, item)
+            return True
+
+        self.points.append((x, y, item))
+        if len(self.points) > self.max_per_node and self.depth < self.max_depth:
+            self._split()
+        return True
+
+    def query_range(self, x: float, y: float, radius: float) -> List[Any]:
+        """
+        Returns every item stored within radius of (x, y).
+        """
+        found = []
+        self._query(x, y, radius, radius * radius, found)
+        return found
+
+    def _query(self, x: float, y: float, radius: float, radius_sq: float, found: List[Any]):
+        # Skip nodes whose bbox does not intersect the query square
+        min_x, min_y, max_x, max_y = self.bbox
+        if x + radius < min_x or x - radius > max_x or y + radius < min_y or y - radius > max_y:
+            return
+
+        if self.children is not None:
+            for child in self.children:
+                child._query(x, y, radius, radius_sq, found)
+            return
+
+        for px, py, item in self.points:
+            if (px - x) ** 2 + (py - y) ** 2 <= radius_sq:
+                found.append(item)
@@ -30,5 +30,7 @@ class CameraData:
 class ObjectData:
     id: int
     timestamp: float
-    position: tuple[float, float, float]
-    velocity: tuple[float, float, float]
\ No newline at end of file
+    # (lon, lat, alt), usually a row view into the pipeline's (N, 3) position array
+    position: np.ndarray[tuple[Literal[1], Literal[3]]]
+    # (vx, vy, vz), usually a row view into the pipeline's (N, 3) velocity array
+    velocity: np.ndarray[tuple[Literal[1], Literal[3]]]
\ No newline at end of file
@@ -1,7 +1,13 @@
 import sys
 import math
 import time
+import struct
+import zlib
+import subprocess
+import tempfile
 import threading
+import queue
+import multiprocessing
 import asyncio
 import pyshark
 
@@ -11,23 +17,411 @@ def calculate_velocity_vector(speed_h, direction_deg, speed_v):
     Converts Speed (magnitude) and Direction (degrees) into a 3D vector (vx, vy, vz).
     Navigation: 0° is North (Positive Y), 90° is East (Positive X).
     """
+    # A single math.sin/cos call is cheaper than an interpolated table lookup
+    # or cmath.rect in Python
     rads = math.radians(direction_deg)
     vx = speed_h * math.sin(rads) # East
     vy = speed_h * math.cos(rads) # North
     vz = speed_v                  # Vertical
     return vx, vy, vz
 
+# Location messages carry the direction in whole degrees, so sin/cos are tabulated
+DIRECTION_SIN = tuple(math.sin(math.radians(d)) for d in range(360))
+DIRECTION_COS = tuple(math.cos(math.radians(d)) for d in range(360))
+
+# Largest integer a float64 state column holds exactly
+MAX_NUMERIC_ID = 2**53
+
+def object_id_for(uas_id: str) -> int:
+    """
+    Maps a UAS ID (serial number) to the integer ID used by the ObjectManager.
+    Numeric serials up to 2**53 (exact in the float64 state arrays) are used as
+    is, others are hashed with CRC32, which unlike hash() gives the same ID on
+    every run.
+    """
+    if uas_id.isascii() and uas_id.isdigit():
+        numeric_id = int(uas_id)
+        if numeric_id <= MAX_NUMERIC_ID:
+            return numeric_id
+    return zlib.crc32(uas_id.encode())
+
+def flatten_layer_fields(fields: dict, prefix: str, out: dict = None) -> dict:
+    """
+    Flattens a pyshark JSON layer's nested field dict into {name: value}, with
+    the names XML mode uses for layer attributes
+    ('opendroneid.location.latitude' -> 'location_latitude').
+    """
+    if out is None:
+        out = {}
+    for key, value in fields.items():
+        if isinstance(value, list):
+            # Repeated fields, keep the first
+            value = value[0]
+        if isinstance(value, dict):
+            # Subtree (e.g. one message of a message pack)
+            flatten_layer_fields(value, prefix, out)
+        elif key.startswith(prefix):
+            out.setdefault(key[len(prefix):].replace('.', '_'), value)
+    return out
+
+# --- OPENDRONEID WIRE FORMAT (ASTM F3411) ---
+# Beacon vendor specific element: OUI FA:0B:BC, vendor type 0x0D,
+# a message counter byte and then a message pack of 25 byte messages
+VENDOR_SPECIFIC_ELEMENT = 0xDD
+ODID_PREFIX = b'\xfa\x0b\xbc\x0d'
+ODID_MESSAGE_SIZE = 25
+ODID_BASIC_ID = 0x0
+ODID_LOCATION = 0x1
+ODID_MESSAGE_PACK = 0xF
+# Location message from byte 1: flags, direction, horizontal speed, vertical speed,
+# latitude, longitude (int32 * 1e-7), pressure altitude, geodetic altitude
+LOCATION_STRUCT = struct.Struct('<BBBbiiHH')
+# Decoded horizontal speed (m/s) indexed by speed multiplier flag << 8 | encoded speed
+HORIZONTAL_SPEEDS = tuple(s * 0.25 for s in range(256)) + tuple(s * 0.75 + 255 * 0.25 for s in range(256))
+# Drop the oldest cached transmitter beyond this many
+MAX_TRACKED_MACS = 1024
+
+# --- 802.11 BEACON FRAME LAYOUT ---
+# Radiotap header length (bytes 2-3), first frame control byte of a beacon,
+# and where the information elements start (24 byte MAC header + 12 byte
+# timestamp, interval and capabilities). The transmitter address is at 10-15.
+RADIOTAP_LENGTH = struct.Struct('<H')
+BEACON_FRAME_CONTROL = 0x80
+BEACON_ELEMENTS_OFFSET = 36
+
+# --- TSHARK EK FIELDS ---
+# Only these fields are printed by the tshark backend, EK names them with
+# '_' for '.' (opendroneid.location.latitude -> opendroneid_location_latitude)
+TSHARK_FIELDS = (
+    'wlan.sa',
+    'opendroneid.basic_id.id',
+    'opendroneid.location.latitude',
+    'opendroneid.location.longitude',
+    'opendroneid.location.geodetic_altitude',
+    'opendroneid.location.speed_horizontal',
+    'opendroneid.location.direction',
+    'opendroneid.location.speed_vertical',
+)
+EK_ODID_PREFIX = 'opendroneid_'
+
+ODID_DISPLAY_FILTER = 'opendroneid'
+# BPF capture filters splitting one interface between two capture processes
+# by the lowest bit of the transmitter MAC (last byte of addr2, offset 15 of
+# the 802.11 header). Frames are dropped before tshark dissects them, so each
+# process only pays for its half
+MAC_SHARD_FILTERS = (
+    'wlan[15] & 1 = 0',
+    'wlan[15] & 1 = 1',
+)
+# Capture filter of the scapy backend, Remote ID is broadcast in beacons
+BEACON_CAPTURE_FILTER = 'type mgt subtype beacon'
+
+# Location message fields read by update_from_fields, position is required
+# (None marks a missing field) and speeds default to 0
+LOCATION_FIELDS = (
+    'location_latitude', 'location_longitude', 'location_geodetic_altitude',
+    'location_speed_horizontal', 'location_direction', 'location_speed_vertical',
+)
+LOCATION_DEFAULTS = (None, None, None, 0.0, 0.0, 0.0)
+
+def iter_odid_messages(elements: bytes):
+    """
+    Yields every 25 byte OpenDroneID message found in a beacon's information elements.
+    """
+    offset = 0
+    end = len(elements)
+    while offset + 2 <= end:
+        element_id = elements[offset]
+        length = elements[offset + 1]
+        body_start = offset + 2
+        offset = body_start + length
+        if offset > end:
+            return
+        if element_id != VENDOR_SPECIFIC_ELEMENT or elements[body_start:body_start + 4] != ODID_PREFIX:
+            continue
+
+        # Skip the prefix and message counter
+        start = body_start + 5
+        if start < offset and elements[start] >> 4 == ODID_MESSAGE_PACK:
+            if start + 3 > offset:
+                continue
+            size = elements[start + 1]
+            count = elements[start + 2]
+            start += 3
+        else:
+            size = ODID_MESSAGE_SIZE
+            count = 1
+
+        for i in range(count):
+            message = elements[start + i * size:start + (i + 1) * size]
+            if len(message) < ODID_MESSAGE_SIZE:
+                break
+            yield message
+
+def parse_basic_id(message: bytes) -> str:
+    """
+    Returns the UAS ID (serial number) of a Basic ID message.
+    """
+    return message[2:22].rstrip(b'\x00').decode('ascii', errors='ignore')
+
+def parse_location(message: bytes):
+    """
+    Returns (lat, lon, alt, vx, vy, vz) from a Location message.
+    """
+    flags, direction, speed, speed_v, lat, lon, _, alt = LOCATION_STRUCT.unpack_from(message, 1)
+
+    # Bit 1 selects the 180-359 degree half, bit 0 the speed multiplier
+    if flags & 0x02:
+        direction += 180
+    direction %= 360
+    speed_h = HORIZONTAL_SPEEDS[(flags & 0x01) << 8 | speed]
+
+    # Same as calculate_velocity_vector, with the tabulated sin/cos
+    vx = speed_h * DIRECTION_SIN[direction] # East
+    vy = speed_h * DIRECTION_COS[direction] # North
+    return lat * 1e-7, lon * 1e-7, alt * 0.5 - 1000, vx, vy, speed_v * 0.5
+
+def parse_beacon(frame: bytes, radiotap: bool = True):
+    """
+    Splits a raw beacon frame into (source MAC, information elements) by
+    fixed offsets. Returns None for any other frame.
+    :param radiotap: Whether the frame starts with a radiotap header (monitor mode).
+    """
+    if radiotap and len(frame) < 4:
+        return None
+    start = RADIOTAP_LENGTH.unpack_from(frame, 2)[0] if radiotap else 0
+    if len(frame) < start + BEACON_ELEMENTS_OFFSET or frame[start] != BEACON_FRAME_CONTROL:
+        return None
+    source_mac = frame[start + 10:start + 16].hex(':')
+    return source_mac, frame[start + BEACON_ELEMENTS_OFFSET:]
+
 # --- THREAD RUNNER ---
-def run_sniffer_thread(object_manager, interface='Wi-Fi'):
+# Updates of the same object within this window are coalesced, only the latest is applied
+COALESCE_WINDOW_SECONDS = 0.1
+
+class QueuedUpdates:
     """
-    Starts the sniffer loop in a non-blocking daemon thread.
+    Stands in for the ObjectManager on the capture thread. update_object only
+    enqueues, a worker thread applies the updates, so capture never waits on
+    the manager's locks. The worker applies only the latest update of every
+    object per COALESCE_WINDOW_SECONDS.
     """
-    t = threading.Thread(target=sniff_loop, args=(object_manager, interface), daemon=True)
+    def __init__(self, object_manager, updates=None):
+        """
+        :param updates: Queue to drain, a multiprocessing.Queue lets capture processes feed it.
+        """
+        self.object_manager = object_manager
+        self.updates = updates if updates is not None else queue.SimpleQueue()
+        self.worker = threading.Thread(target=self._drain, daemon=True)
+
+    def start(self):
+        self.worker.start()
+        return self
+
+    def update_object(self, **kwargs):
+        self.updates.put(kwargs)
+
+    def _drain(self):
+        # Object ID -> latest update kwargs in the current window
+        latest = {}
+        while True:
+            # Idle until an update arrives, then collect for one window
+            kwargs = self.updates.get()
+            latest[kwargs['id']] = kwargs
+            deadline = time.monotonic() + COALESCE_WINDOW_SECONDS
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    kwargs = self.updates.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                latest[kwargs['id']] = kwargs
+
+            for kwargs in latest.values():
+                try:
+                    self.object_manager.update_object(**kwargs)
+                except Exception as e:
+                    print(f"[Sniffer] Failed to apply update: {e}")
+            latest.clear()
+
+def run_sniffer_thread(object_manager, interface='Wi-Fi', backend='pyshark'):
+    """
+    Starts the sniffer loop in a non-blocking daemon thread. Updates reach the
+    object manager through a QueuedUpdates worker thread.
+    :param backend: 'pyshark' (tshark dissector), 'tshark' (tshark EK output parsed
+    directly with orjson) or 'scapy' (in-process libpcap capture).
+    """
+    targets = {'pyshark': sniff_loop, 'tshark': sniff_loop_tshark, 'scapy': sniff_loop_scapy}
+    target = targets.get(backend, sniff_loop)
+    updates = QueuedUpdates(object_manager).start()
+    t = threading.Thread(target=target, args=(updates, interface), daemon=True)
     t.start()
     return t
 
+def run_sniffer_async(object_manager, interfaces):
+    """
+    Runs the pyshark captures of all interfaces as sniff_async coroutines on
+    a single event loop thread, instead of one thread per interface.
+    """
+    updates = QueuedUpdates(object_manager).start()
+
+    async def sniff_all():
+        await asyncio.gather(*(sniff_async(updates, interface) for interface in interfaces))
+
+    t = threading.Thread(target=asyncio.run, args=(sniff_all(),), daemon=True)
+    t.start()
+    return t
+
+class QueueSink:
+    """
+    Picklable update_object for capture processes, puts every update on a
+    multiprocessing.Queue drained by the parent's QueuedUpdates.
+    """
+    def __init__(self, updates):
+        self.updates = updates
+
+    def update_object(self, **kwargs):
+        self.updates.put(kwargs)
+
+def sniff_process(updates, interface, backend, capture_filter):
+    """
+    Entry point of a run_sniffer_pool capture process.
+    """
+    sink = QueueSink(updates)
+    if backend == 'scapy':
+        sniff_loop_scapy(sink, interface, capture_filter)
+    elif backend == 'tshark':
+        sniff_loop_tshark(sink, interface, capture_filter=capture_filter)
+    else:
+        sniff_loop(sink, interface, capture_filter=capture_filter)
+
+def run_sniffer_pool(object_manager, interfaces, backend='pyshark'):
+    """
+    Runs one capture process per interface, sidestepping the GIL for the
+    packet parsing. A single interface is split into two processes by
+    the MAC_SHARD_FILTERS capture filters.
+    Returns the started processes.
+    """
+    updates = multiprocessing.Queue()
+    QueuedUpdates(object_manager, updates).start()
+
+    if len(interfaces) == 1:
+        shards = [(interfaces[0], capture_filter) for capture_filter in MAC_SHARD_FILTERS]
+    else:
+        shards = [(interface, None) for interface in interfaces]
+
+    processes = []
+    for interface, capture_filter in shards:
+        process = multiprocessing.Process(
+            target=sniff_process, args=(updates, interface, backend, capture_filter), daemon=True
+        )
+        process.start()
+        processes.append(process)
+    return processes
+
 # --- MAIN LOOP ---
-def sniff_loop(object_manager, interface):
+def update_from_fields(object_manager, drone_cache, source_mac, fields):
+    """
+    Merges one packet's OpenDroneID fields (XML mode names, see
+    flatten_layer_fields) into the per-MAC cache and pushes the drone to the
+    object manager once both its ID and location are known.
+    """
+    cache_entry = drone_cache.get(source_mac)
+    if cache_entry is None:
+        cache_entry = drone_cache[source_mac] = {'serial': None, 'id': None, 'last_update': 0}
+
+    # --- MESSAGE TYPE 1: BASIC ID (contains Serial Number) ---
+    # JSON and EK output already give the serial as a str
+    raw_id = fields.get('basic_id_id')
+    # Only map the serial to an integer ID when it is first seen
+    if raw_id is not None and raw_id != cache_entry['serial']:
+        cache_entry['serial'] = raw_id
+        cache_entry['id'] = object_id_for(raw_id)
+
+    # --- MESSAGE TYPE 2: LOCATION (contains Lat/Lon/Alt/Speed) ---
+    location = tuple(map(fields.get, LOCATION_FIELDS, LOCATION_DEFAULTS))
+    if None not in location:
+        lat, lon, alt, speed_h, direction, speed_v = map(float, location)
+
+        vx, vy, vz = calculate_velocity_vector(speed_h, direction, speed_v)
+
+        # Update cache
+        cache_entry.update({
+            'lat': lat, 'lon': lon, 'alt': alt,
+            'vx': vx, 'vy': vy, 'vz': vz,
+            'last_update': time.time()
+        })
+
+    # --- UPDATE MANAGER ---
+    # Only push to object manager if we have BOTH an ID and a recent Location
+    if cache_entry['id'] is not None and 'lat' in cache_entry:
+        # Send to main tracking system
+        object_manager.update_object(
+            id=cache_entry['id'],
+            lat=cache_entry['lat'],
+            lon=cache_entry['lon'],
+            alt=cache_entry['alt'],
+            vx=cache_entry.get('vx', 0.0),
+            vy=cache_entry.get('vy', 0.0),
+            vz=cache_entry.get('vz', 0.0)
+        )
+
+# pyshark capture options shared by live and file captures. JSON output is
+# much cheaper to parse than the default PDML, -J limits it to the layers
+# read by make_packet_handler (pyshark itself needs frame). Unlike -j it keeps
+# the child nodes, which hold the per-message opendroneid fields
+PYSHARK_JSON_OPTIONS = {
+    'use_json': True,
+    'include_raw': False,
+    'custom_parameters': {'-J': 'frame wlan opendroneid'},
+}
+
+def open_live_capture(interface, display_filter=ODID_DISPLAY_FILTER, capture_filter=None):
+    """
+    Creates the pyshark capture used by sniff_loop and sniff_async.
+    """
+    # Filter for OpendroneID.
+    return pyshark.LiveCapture(
+        interface=interface, display_filter=display_filter, bpf_filter=capture_filter,
+        **PYSHARK_JSON_OPTIONS
+    )
+
+def make_packet_handler(object_manager):
+    """
+    Returns a pyshark packet callback feeding object_manager, with its own
+    per-MAC cache.
+    """
+    # Cache to store data for MAC addresses (since ID and Location often come in different packets)
+    drone_cache = {}
+
+    def on_packet(packet):
+        # The display filter guarantees an opendroneid layer, each layer
+        # access walks the packet's layers so it is only done once
+        try:
+            layer = packet.opendroneid
+        except AttributeError:
+            return
+
+        # Message fields are nested in per-message subtrees in JSON mode
+        fields = flatten_layer_fields(layer._all_fields, 'opendroneid.')
+        
+        # Get the source MAC address to link messages together
+        try:
+            source_mac = packet.wlan.sa
+        except AttributeError:
+            source_mac = "unknown_mac"
+        
+        try:
+            update_from_fields(object_manager, drone_cache, source_mac, fields)
+        except ValueError:
+            # Malformed numeric field
+            return
+
+    return on_packet
+
+def sniff_loop(object_manager, interface, display_filter=ODID_DISPLAY_FILTER, capture_filter=None):
     # --- CRITICAL FIX: INITIALIZE EVENT LOOP ---
     # Pyshark uses asyncio. When running in a separate thread, 
     # we must explicitly create a new event loop for that thread.
@@ -36,71 +430,189 @@ def sniff_loop(object_manager, interface):
     # -------------------------------------------
 
     print(f"[Sniffer] Starting background capture on interface: {interface}...")
-    
-    # Cache to store data for MAC addresses (since ID and Location often come in different packets)
+
+    try:
+        capture = open_live_capture(interface, display_filter, capture_filter)
+
+        # Runs the event loop once for the whole capture, sniff_continuously
+        # spins it up again for every packet
+        capture.apply_on_packets(make_packet_handler(object_manager))
+
+    except Exception as e:
+        print(f"[Sniffer] CRITICAL ERROR: {e}")
+        print(f"Ensure '{interface}' is correct. (Windows: 'Wi-Fi', Linux: 'wlan0' or 'mon0')")
+
+async def sniff_async(object_manager, interface, display_filter=ODID_DISPLAY_FILTER):
+    """
+    Coroutine version of sniff_loop for callers that already run an event
+    loop, reads tshark's output through pyshark's async pipe path.
+    """
+    print(f"[Sniffer] Starting async capture on interface: {interface}...")
+
+    try:
+        capture = open_live_capture(interface, display_filter)
+        await capture.packets_from_tshark(make_packet_handler(object_manager))
+
+    except Exception as e:
+        print(f"[Sniffer] CRITICAL ERROR: {e}")
+        print(f"Ensure '{interface}' is correct. (Windows: 'Wi-Fi', Linux: 'wlan0' or 'mon0')")
+
+def sniff_file(object_manager, path, display_filter=ODID_DISPLAY_FILTER):
+    """
+    Replays a capture file (pcap/pcapng) into object_manager through a single
+    tshark run, blocking until the whole file is read.
+    """
+    print(f"[Sniffer] Replaying capture file: {path}...")
+
+    try:
+        # Packets are handed to the callback only, never accumulated
+        capture = pyshark.FileCapture(path, keep_packets=False, display_filter=display_filter, **PYSHARK_JSON_OPTIONS)
+        capture.apply_on_packets(make_packet_handler(object_manager))
+        capture.close()
+
+    except Exception as e:
+        print(f"[Sniffer] CRITICAL ERROR: {e}")
+
+def sniff_loop_tshark(object_manager, interface, display_filter=ODID_DISPLAY_FILTER, capture_filter=None):
+    """
+    Runs tshark with EK (newline delimited JSON) output restricted to
+    TSHARK_FIELDS and parses it with orjson, skipping pyshark's per-packet
+    Packet/Layer objects.
+    """
+    # Optional dependency, only needed for this backend
+    import orjson
+    from pyshark.tshark.tshark import get_process_path
+
+    print(f"[Sniffer] Starting tshark capture on interface: {interface}...")
+
     drone_cache = {}
+    process = None
+    # tshark's error output, a file instead of a pipe so a chatty tshark
+    # can't block on it while only stdout is read
+    errors = tempfile.TemporaryFile()
 
     try:
-        # Filter for OpendroneID. 
-        capture = pyshark.LiveCapture(interface=interface, display_filter='opendroneid')
+        command = [get_process_path(), '-l', '-n', '-i', interface, '-Y', display_filter, '-T', 'ek']
+        for field in TSHARK_FIELDS:
+            command += ['-e', field]
+        if capture_filter:
+            command += ['-f', capture_filter]
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors)
 
-        for packet in capture.sniff_continuously():
+        for line in process.stdout:
+            # Every document is preceded by a bulk index line
+            if line.startswith(b'{"index"'):
+                continue
             try:
-                if not hasattr(packet, 'opendroneid'):
-                    continue
-
-                layer = packet.opendroneid
-                
-                # Get the source MAC address to link messages together
-                source_mac = getattr(packet, 'wlan', None).sa if hasattr(packet, 'wlan') else "unknown_mac"
-                
-                if source_mac not in drone_cache:
-                    drone_cache[source_mac] = {'id': None, 'last_update': 0}
-
-                # --- MESSAGE TYPE 1: BASIC ID (contains Serial Number) ---
-                if hasattr(layer, 'basic_id_id'):
-                    raw_id = layer.basic_id_id
-                    drone_cache[source_mac]['id'] = str(raw_id)
-
-                # --- MESSAGE TYPE 2: LOCATION (contains Lat/Lon/Alt/Speed) ---
-                if hasattr(layer, 'location_latitude'):
-                    lat = float(layer.location_latitude)
-                    lon = float(layer.location_longitude)
-                    alt = float(layer.location_geodetic_altitude)
-                    
-                    speed_h = float(getattr(layer, 'location_speed_horizontal', 0.0))
-                    direction = float(getattr(layer, 'location_direction', 0.0))
-                    speed_v = float(getattr(layer, 'location_speed_vertical', 0.0))
-                    
-                    vx, vy, vz = calculate_velocity_vector(speed_h, direction, speed_v)
-                    
-                    # Update cache
-                    drone_cache[source_mac].update({
-                        'lat': lat, 'lon': lon, 'alt': alt,
-                        'vx': vx, 'vy': vy, 'vz': vz,
-                        'last_update': time.time()
-                    })
-
-                # --- UPDATE MANAGER ---
-                # Only push to object manager if we have BOTH an ID and a recent Location
-                cache_entry = drone_cache[source_mac]
-                
-                if cache_entry['id'] and 'lat' in cache_entry:
-                    # Send to main tracking system
-                    object_manager.update_object(
-                        id=cache_entry['id'],
-                        lat=cache_entry['lat'],
-                        lon=cache_entry['lon'],
-                        alt=cache_entry['alt'],
-                        vx=cache_entry.get('vx', 0.0),
-                        vy=cache_entry.get('vy', 0.0),
-                        vz=cache_entry.get('vz', 0.0)
-                    )
-
-            except Exception:
-                # Ignore partial packet errors
+                layers = orjson.loads(line).get('layers')
+            except orjson.JSONDecodeError:
+                # Truncated line
+                continue
+            if not layers:
                 continue
 
+            source_mac = layers.get('wlan_sa', ("unknown_mac",))[0]
+            # Every EK field is a list of its occurrences, keep the first
+            fields = {
+                key[len(EK_ODID_PREFIX):]: values[0]
+                for key, values in layers.items() if key.startswith(EK_ODID_PREFIX)
+            }
+            try:
+                update_from_fields(object_manager, drone_cache, source_mac, fields)
+            except ValueError:
+                # Malformed numeric field
+                continue
+
+        # stdout ends when tshark exits, e.g. on an invalid -e field, a bad
+        # interface or missing capture permissions
+        if process.wait() != 0:
+            errors.seek(0)
+            message = errors.read().decode(errors='replace').strip()
+            print(f"[Sniffer] CRITICAL ERROR: tshark exited with code {process.returncode}: {message}")
+            print(f"Ensure '{interface}' is correct. (Windows: 'Wi-Fi', Linux: 'wlan0' or 'mon0')")
+
     except Exception as e:
         print(f"[Sniffer] CRITICAL ERROR: {e}")
-        print(f"Ensure '{interface}' is correct. (Windows: 'Wi-Fi', Linux: 'wlan0' or 'mon0')")
\ No newline at end of file
+        print(f"Ensure '{interface}' is correct. (Windows: 'Wi-Fi', Linux: 'wlan0' or 'mon0')")
+
+    finally:
+        if process is not None:
+            process.kill()
+        errors.close()
+
+def sniff_loop_scapy(object_manager, interface, capture_filter=None):
+    """
+    Captures beacons with scapy and decodes the OpenDroneID element directly,
+    without spawning tshark. Frames are read undissected and split by fixed
+    offsets (parse_beacon), scapy only provides the capture socket.
+    """
+    # Optional dependency, only needed for this backend
+    from scapy.all import conf, RadioTap
+
+    print(f"[Sniffer] Starting scapy capture on interface: {interface}...")
+
+    # MAC -> (uas_id, object_id, (lat, lon, alt, vx, vy, vz))
+    drone_cache = {}
+
+    def handle_beacon(source_mac, elements):
+        uas_id, object_id, location = drone_cache.get(source_mac, (None, None, None))
+        found = False
+
+        for message in iter_odid_messages(elements):
+            message_type = message[0] >> 4
+            if message_type == ODID_BASIC_ID:
+                serial = parse_basic_id(message)
+                # Only map the serial to an integer ID when it is first seen
+                if serial and serial != uas_id:
+                    uas_id = serial
+                    object_id = object_id_for(serial)
+                found = True
+            elif message_type == ODID_LOCATION:
+                location = parse_location(message)
+                found = True
+
+        if not found:
+            return
+
+        if source_mac not in drone_cache and len(drone_cache) >= MAX_TRACKED_MACS:
+            # Dicts keep insertion order, evict the oldest transmitter
+            del drone_cache[next(iter(drone_cache))]
+        drone_cache[source_mac] = (uas_id, object_id, location)
+
+        # Only push to object manager if we have BOTH an ID and a Location
+        if object_id is not None and location:
+            lat, lon, alt, vx, vy, vz = location
+            object_manager.update_object(id=object_id, lat=lat, lon=lon, alt=alt, vx=vx, vy=vy, vz=vz)
+
+    try:
+        bpf_filter = BEACON_CAPTURE_FILTER
+        if capture_filter:
+            bpf_filter += f' and ({capture_filter})'
+        sock = conf.L2listen(iface=interface, filter=bpf_filter)
+        while True:
+            link_type, frame, _ = sock.recv_raw()
+            if not frame:
+                continue
+            beacon = parse_beacon(frame, radiotap=link_type is RadioTap)
+            if beacon is not None:
+                handle_beacon(*beacon)
+
+    except Exception as e:
+        print(f"[Sniffer] CRITICAL ERROR: {e}")
+        print(f"Ensure '{interface}' is in monitor mode. (Linux: 'wlan0mon' or 'mon0')")
+
+if __name__ == '__main__':
+    # Debug run through the same filtered capture path, updates are only counted and printed
+    # usage: python remoteid_sniffer.py [interface] [pyshark|tshark|scapy]
+    interface = sys.argv[1] if len(sys.argv) > 1 else 'Wi-Fi'
+    backend = sys.argv[2] if len(sys.argv) > 2 else 'pyshark'
+
+    class PrintingManager:
+        def __init__(self):
+            self.updates = 0
+
+        def update_object(self, **kwargs):
+            self.updates += 1
+            print(f"[Sniffer] Update {self.updates}: {kwargs}")
+
+    run_sniffer_thread(PrintingManager(), interface, backend).join()